@@ -7,6 +7,7 @@ from app.core.settings import settings
 from app.database.adapter import adapter
 from app.database.models import User
 from app.database.session import get_async_session
+from app.dependencies.rate_limit import RateLimiter
 from app.dependencies.responses import okresponse
 from fastapi import APIRouter, Depends
 from fastapi.exceptions import HTTPException
@@ -17,7 +18,14 @@ router = APIRouter()
 logger = get_logger()
 
 
-@router.post("/change-password")
+@router.post(
+    "/change-password",
+    dependencies=[
+        Depends(
+            RateLimiter("change_password", settings.rate_limit_settings.rate_limit_change_password)
+        )
+    ],
+)
 async def change_pwd(email: str, session: Annotated[AsyncSession, Depends(get_async_session)]):
     user = await adapter.get_by_value(User, "email", email, session=session)
     if not user:
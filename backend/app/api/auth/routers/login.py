@@ -2,11 +2,13 @@ import re
 from typing import Annotated
 
 from app.api.auth.schemas import UserLogin
-from app.api.auth.utils import verify_password
+from app.api.auth.utils import verify_password_async
+from app.core.settings import settings
 from app.database.adapter import adapter
 from app.database.models import User
 from app.database.session import get_async_session
-from app.utils.token_manager import TokenManager
+from app.dependencies.rate_limit import RateLimiter
+from app.utils.session_store import session_store
 from fastapi import APIRouter, Depends, status
 from fastapi.exceptions import HTTPException
 from fastapi.responses import JSONResponse
@@ -25,7 +27,11 @@ def is_valid_username(value: str) -> bool:
     return bool(re.match(pattern, value))
 
 
-@router.post("/login", status_code=status.HTTP_200_OK)
+@router.post(
+    "/login",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RateLimiter("login", settings.rate_limit_settings.rate_limit_login))],
+)
 async def token(
     user: UserLogin,
     session: Annotated[AsyncSession, Depends(get_async_session)],
@@ -44,11 +50,12 @@ async def token(
 
     bd_user = bd_user[0]
 
-    if not verify_password(user.password, bd_user.hashed_password):
+    if not await verify_password_async(user.password, bd_user.hashed_password):
         raise HTTPException(403, "Forbidden")
 
+    access_token, refresh_token = await session_store.issue(bd_user.id)
     response = JSONResponse({"message": "success", "status": "success"})
-    response.set_cookie("access_token", TokenManager.create_token({"sub": str(bd_user.id)}))
-    response.set_cookie("refresh_token", TokenManager.create_token({"sub": str(bd_user.id)}, False))
+    response.set_cookie("access_token", access_token)
+    response.set_cookie("refresh_token", refresh_token)
 
     return response
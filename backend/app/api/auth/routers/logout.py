@@ -3,7 +3,10 @@ from typing import Annotated, Optional
 from app.database.models import User
 from app.dependencies.checks import check_user_token
 from app.dependencies.responses import okresponse
+from app.utils.session_store import session_store
+from app.utils.token_manager import TokenManager
 from fastapi import APIRouter, Cookie, Depends, status
+from fastapi.exceptions import HTTPException
 
 router = APIRouter()
 
@@ -14,6 +17,12 @@ async def logout(
     access_token: Annotated[Optional[str], Cookie()] = None,
     refresh_token: Annotated[Optional[str], Cookie()] = None,
 ):
+    if refresh_token:
+        try:
+            payload = TokenManager.decode_token(refresh_token, access=False)
+            await session_store.revoke(user.id, payload)
+        except HTTPException:
+            pass
     response = okresponse()
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
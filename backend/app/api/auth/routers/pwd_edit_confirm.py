@@ -1,11 +1,14 @@
 from typing import Annotated
 
 from app.api.auth.schemas import EditPwdRequest
-from app.api.auth.utils import get_password_hash, verify_password
+from app.api.auth.utils import get_password_hash_async, verify_password_async
+from app.core.settings import settings
 from app.database.adapter import adapter
 from app.database.models import User
 from app.database.session import get_async_session
+from app.dependencies.rate_limit import RateLimiter
 from app.dependencies.responses import okresponse
+from app.utils.session_store import session_store
 from fastapi import APIRouter, Depends
 from fastapi.exceptions import HTTPException
 from itsdangerous import BadSignature
@@ -15,13 +18,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 router = APIRouter()
 
 
-@router.put("/change-password")
+@router.put(
+    "/change-password",
+    dependencies=[
+        Depends(
+            RateLimiter("change_password", settings.rate_limit_settings.rate_limit_change_password)
+        )
+    ],
+)
 async def edit_pwd_confirm(
     code: str,
     password: EditPwdRequest,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ):
-    serializer = URLSafeTimedSerializer()
+    serializer = URLSafeTimedSerializer(
+        secret_key=settings.jwt_settings.jwt_secret_key.get_secret_value()
+    )
     try:
         user_id = serializer.loads(code, max_age=600)
     except BadSignature:
@@ -29,8 +41,9 @@ async def edit_pwd_confirm(
     user = await adapter.get_by_id(User, user_id, session=session)
     if not user:
         raise HTTPException(404, "User with this token does not exist")
-    if verify_password(password.password, user.password_hash):
+    if await verify_password_async(password.password, user.hashed_password):
         raise HTTPException(400, "Your password is the same with the old one")
-    password_hash = get_password_hash(password=password.password)
-    await adapter.update_by_id(User, user_id, {"password_hash": password_hash}, session=session)
+    password_hash = await get_password_hash_async(password.password)
+    await adapter.update_by_id(User, user_id, {"hashed_password": password_hash}, session=session)
+    await session_store.revoke_all(user_id)
     return okresponse("Password changed succesfully")
@@ -1,11 +1,13 @@
-from typing import Annotated
+from typing import Annotated, Dict, Literal
 
 from app.core.logging import get_logger
 from app.database.models import User
 from app.dependencies.checks import check_refresh
 from app.dependencies.responses import okresponse
+from app.utils.cookies import get_tokens_cookies
+from app.utils.session_store import session_store
 from app.utils.token_manager import TokenManager
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, status
 
 logger = get_logger()
 
@@ -14,12 +16,13 @@ router = APIRouter()
 
 
 @router.get("/refresh", status_code=status.HTTP_200_OK)
-async def refresh(response: Response, user: Annotated[User, Depends(check_refresh)]):
-    response.set_cookie(
-        "access_token",
-        TokenManager.create_token(
-            {"sub": str(user.id), "type": "access"},
-            TokenManager.ACCESS_TOKEN_EXPIRE_MINUTES,
-        ),
-    )
-    return okresponse()
+async def refresh(
+    tokens: Annotated[Dict[Literal["access", "refresh"], str], Depends(get_tokens_cookies)],
+    user: Annotated[User, Depends(check_refresh)],
+):
+    payload = TokenManager.decode_token(tokens["refresh"], access=False)
+    access_token, refresh_token = await session_store.rotate(user.id, payload)
+    response = okresponse()
+    response.set_cookie("access_token", access_token)
+    response.set_cookie("refresh_token", refresh_token)
+    return response
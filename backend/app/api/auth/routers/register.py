@@ -5,9 +5,11 @@ from typing import Annotated
 from app.api.auth.schemas import UserCreate
 from app.api.auth.tasks import send_confirmation_email
 from app.core.logging import get_logger
+from app.core.settings import settings
 from app.database.adapter import adapter
 from app.database.models import User
 from app.database.session import get_async_session
+from app.dependencies.rate_limit import RateLimiter
 from app.dependencies.responses import badresponse, okresponse
 from app.utils.redis_adapter import redis_adapter
 from fastapi import APIRouter, Depends, status
@@ -24,7 +26,13 @@ def generate_secure_code(length: int = 6) -> str:
     return "".join(secrets.choice(chars) for _ in range(length))
 
 
-@router.post("/register", status_code=status.HTTP_200_OK)
+@router.post(
+    "/register",
+    status_code=status.HTTP_200_OK,
+    dependencies=[
+        Depends(RateLimiter("register", settings.rate_limit_settings.rate_limit_register))
+    ],
+)
 async def register(
     user: UserCreate,
     session: Annotated[AsyncSession, Depends(get_async_session)],
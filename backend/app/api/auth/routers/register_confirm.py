@@ -1,12 +1,12 @@
 from typing import Annotated
 
 from app.api.auth.schemas import UserCreate, UserRegResponse
-from app.api.auth.utils import get_password_hash
+from app.api.auth.utils import get_password_hash_async
 from app.database.adapter import adapter
 from app.database.models import User
 from app.database.session import get_async_session
 from app.utils.redis_adapter import redis_adapter
-from app.utils.token_manager import TokenManager
+from app.utils.session_store import session_store
 from fastapi import APIRouter, Depends, Response, status
 from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -31,15 +31,14 @@ async def confirm_registration(
         "email": user.email,
         "name": user.name,
         "username": f"@{user.username}",
-        "hashed_password": get_password_hash(user.password),
+        "hashed_password": await get_password_hash_async(user.password),
         "description": user.description,
     }
 
     new_user_db = await adapter.insert(User, new_user, session=session)
     await redis_adapter.delete(f"email_verification_code:{user.email}")
-    response.set_cookie("access_token", TokenManager.create_token({"sub": str(new_user_db.id)}))
-    response.set_cookie(
-        "refresh_token", TokenManager.create_token({"sub": str(new_user_db.id)}, False)
-    )
+    access_token, refresh_token = await session_store.issue(new_user_db.id)
+    response.set_cookie("access_token", access_token)
+    response.set_cookie("refresh_token", refresh_token)
 
     return UserRegResponse.model_validate(new_user_db, from_attributes=True)
@@ -1,6 +1,8 @@
 from typing import Annotated
 
 from app.api.auth.schemas import UpdateProfile
+from app.api.user.utils import load_user_id
+from app.api.video.utils import load_user_videos
 from app.database.adapter import adapter
 from app.database.models import User
 from app.database.session import get_async_session
@@ -42,4 +44,6 @@ async def upd_profile(
         raise HTTPException(400, "No fields provided")
 
     await adapter.update_by_id(User, uid, updated_data, session=session)
+    await load_user_id.invalidate(user.username)
+    await load_user_videos.invalidate(uid)
     return okresponse(message="Profile updated successfully")
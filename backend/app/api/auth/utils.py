@@ -1,7 +1,25 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Dict
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from fastapi.exceptions import HTTPException
 from passlib.context import CryptContext
 
+logger = get_logger()
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+pwd_executor = ThreadPoolExecutor(
+    max_workers=settings.password_settings.pwd_hash_workers, thread_name_prefix="pwd-hash"
+)
+pwd_slots = asyncio.Semaphore(
+    settings.password_settings.pwd_hash_workers + settings.password_settings.pwd_hash_queue_size
+)
+pwd_stats: Dict[str, float] = {"calls": 0, "rejected": 0, "total_ms": 0.0, "max_ms": 0.0}
+
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -9,3 +27,27 @@ def get_password_hash(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def run_in_pwd_executor(func: Callable, *args: Any) -> Any:
+    if pwd_slots.locked():
+        pwd_stats["rejected"] += 1
+        logger.warning("Password hashing queue is full")
+        raise HTTPException(503, "Server is busy, try again later", headers={"Retry-After": "1"})
+
+    async with pwd_slots:
+        start = perf_counter()
+        result = await asyncio.get_running_loop().run_in_executor(pwd_executor, func, *args)
+        duration = (perf_counter() - start) * 1000
+        pwd_stats["calls"] += 1
+        pwd_stats["total_ms"] += duration
+        pwd_stats["max_ms"] = max(pwd_stats["max_ms"], duration)
+        return result
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_in_pwd_executor(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_in_pwd_executor(verify_password, plain_password, hashed_password)
@@ -1,11 +1,15 @@
+from datetime import datetime, timezone
 from typing import Annotated
 from uuid import UUID
 
 from app.api.comment.schemas import CommentCreate, CommentCreateResponse
+from app.api.comment.utils import comment_score, invalidate_comments
+from app.core.settings import settings
 from app.database.adapter import adapter
 from app.database.models import Comment, User, Video
 from app.database.session import get_async_session
 from app.dependencies.checks import check_user_token
+from app.dependencies.rate_limit import RateLimiter
 from fastapi import APIRouter, Depends
 from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,7 +17,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 router = APIRouter()
 
 
-@router.post("/add-comment/{video_id}", response_model=CommentCreateResponse, status_code=201)
+@router.post(
+    "/add-comment/{video_id}",
+    response_model=CommentCreateResponse,
+    status_code=201,
+    dependencies=[
+        Depends(
+            RateLimiter("add_comment", settings.rate_limit_settings.rate_limit_add_comment, "user")
+        )
+    ],
+)
 async def add_comment(
     user: Annotated[User, Depends(check_user_token)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
@@ -33,11 +46,12 @@ async def add_comment(
             await adapter.update_by_id(
                 Comment,
                 parent_id,
-                {"replies_count": parent_comment.replies_count + 1},
+                {"replies_count": Comment.replies_count + 1},
                 session=session,
             )
     else:
         parent_username = None
+    created_at = datetime.now(timezone.utc)
     new_comment = {
         "user_id": user.id,
         "user_name": user.name,
@@ -46,7 +60,10 @@ async def add_comment(
         "parent_id": parent_id,
         "parent_username": parent_username,
         "content": content.content,
+        "created_at": created_at,
+        "score": comment_score(0, 0, created_at),
     }
-    await adapter.update_by_id(Video, video_id, {"comments": video.comments + 1}, session=session)
+    await adapter.update_by_id(Video, video_id, {"comments": Video.comments + 1}, session=session)
     new_comm = await adapter.insert(Comment, new_comment, session=session)
+    await invalidate_comments(video_id)
     return CommentCreateResponse(id=new_comm.id)
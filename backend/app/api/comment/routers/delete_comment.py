@@ -1,6 +1,7 @@
 from typing import Annotated
 from uuid import UUID
 
+from app.api.comment.utils import invalidate_comments
 from app.database.adapter import adapter
 from app.database.models import Comment, User, Video
 from app.database.session import get_async_session
@@ -8,6 +9,7 @@ from app.dependencies.checks import check_user_token
 from app.dependencies.responses import emptyresponse
 from fastapi import APIRouter, Depends
 from fastapi.exceptions import HTTPException
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -29,6 +31,10 @@ async def delete_comment(
         raise HTTPException(404, "Video not found")
     await adapter.delete(Comment, comment_id, session=session)
     await adapter.update_by_id(
-        Video, comment.video_id, {"comments": max(video.comments - 1, 0)}, session=session
+        Video,
+        comment.video_id,
+        {"comments": func.greatest(Video.comments - 1, 0)},
+        session=session,
     )
+    await invalidate_comments(comment.video_id)
     return emptyresponse()
@@ -0,0 +1,38 @@
+from typing import Annotated
+from uuid import UUID
+
+from app.api.comment.schemas import CommentTreeResponse
+from app.database.adapter import adapter
+from app.database.models import User
+from app.database.session import get_async_session
+from app.dependencies.checks import check_user_token
+from fastapi import APIRouter, Depends, Query
+from fastapi.exceptions import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter()
+
+
+@router.get("/get-comment-tree/{comment_id}", response_model=CommentTreeResponse)
+async def get_comment_tree(
+    comment_id: UUID,
+    user: Annotated[User, Depends(check_user_token)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    max_depth: int = Query(3, ge=0, le=10),
+    max_children: int = Query(10, ge=1, le=50),
+):
+    rows = await adapter.get_comment_tree(
+        comment_id, user.id, max_depth, max_children, session=session
+    )
+    if not rows:
+        raise HTTPException(404, "Comment not found")
+
+    nodes = {}
+    for comment, like in rows:
+        node = CommentTreeResponse.model_validate(comment, from_attributes=True)
+        node.is_liked_by_user = like is True
+        node.is_disliked_by_user = like is False
+        nodes[node.id] = node
+        if node.id != comment_id:
+            nodes[node.parent_id].children.append(node)
+    return nodes[comment_id]
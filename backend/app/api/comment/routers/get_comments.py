@@ -1,12 +1,14 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, List, Literal, Optional
 from uuid import UUID
 
 from app.api.comment.schemas import CommentResponse
+from app.api.comment.utils import load_root_comments
+from app.core.settings import settings
 from app.database.adapter import adapter
-from app.database.models import Comment, CommentLike, User, Video
+from app.database.models import User, Video
 from app.database.session import get_async_session
 from app.dependencies.checks import check_user_token
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,34 +20,43 @@ async def get_comments(
     video_id: UUID,
     user: Annotated[User, Depends(check_user_token)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
+    sort: Literal["new", "top"] = "new",
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    after_id: Optional[UUID] = None,
+    after_score: Optional[float] = None,
 ):
+    cache_page_size = settings.cache_settings.cache_comments_page_size
+    if after_id is None and (limit is None or limit <= cache_page_size):
+        comments = await load_root_comments(video_id, sort)
+        if comments is None:
+            raise HTTPException(404, "Video not found")
+        # Without a limit every root is returned, the cached page only covers that when it is short
+        if limit is not None or len(comments) < cache_page_size:
+            result = [CommentResponse.model_validate(comment) for comment in comments[:limit]]
+            likes = await adapter.get_comment_likes(
+                user.id, [comment.id for comment in result], session=session
+            )
+            for comment in result:
+                comment.is_liked_by_user = likes.get(comment.id) is True
+                comment.is_disliked_by_user = likes.get(comment.id) is False
+            return result
+
     video = await adapter.get_by_id(Video, video_id, session=session)
     if not video:
         raise HTTPException(404, "Video not found")
-    root_comments = await adapter.get_by_values(
-        Comment, {"video_id": video_id, "parent_id": None}, session=session
+    rows = await adapter.get_root_comments(
+        video_id,
+        user.id,
+        sort=sort,
+        limit=limit,
+        after_id=after_id,
+        after_score=after_score,
+        session=session,
     )
-    if not root_comments:
-        return []
-    comment_ids = [c.id for c in root_comments]
-    user_likes = {}
-    if user:
-        for uid in comment_ids:
-            like = await adapter.get_by_values(
-                CommentLike,
-                and_conditions={"user_id": user.id},
-                or_conditions={"comment_id": uid},
-                mode="mixed",
-                session=session,
-            )
-            if like:
-                user_likes[like[0].comment_id] = like[0].like
     result = []
-    for c in root_comments:
-        liked = user_likes.get(c.id) is True
-        disliked = user_likes.get(c.id) is False
+    for c, like in rows:
         comment = CommentResponse.model_validate(c, from_attributes=True)
-        comment.is_liked_by_user = liked
-        comment.is_disliked_by_user = disliked
+        comment.is_liked_by_user = like is True
+        comment.is_disliked_by_user = like is False
         result.append(comment)
     return result
@@ -1,6 +1,7 @@
 from typing import Annotated
 from uuid import UUID
 
+from app.api.comment.utils import invalidate_comments, update_comment_score
 from app.database.adapter import adapter
 from app.database.models import Comment, CommentLike, User
 from app.database.session import get_async_session
@@ -8,6 +9,7 @@ from app.dependencies.checks import check_user_token
 from app.dependencies.responses import okresponse
 from fastapi import APIRouter, Depends
 from fastapi.exceptions import HTTPException
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -28,35 +30,38 @@ async def like_comment(
         {"user_id": user.id, "comment_id": comment_id},
         session=session,
     )
+    likes = dislikes = 0
     if existing_like:
         prev_like = existing_like[0]
         await adapter.delete(CommentLike, prev_like.id, session=session)
 
         if prev_like.like:
-            comment.likes = max(comment.likes - 1, 0)
+            likes -= 1
         else:
-            comment.dislikes = max(comment.dislikes - 1, 0)
-
-        if prev_like.like == like:
-            await adapter.update_by_id(
-                Comment,
-                comment_id,
-                {"likes": comment.likes, "dislikes": comment.dislikes},
-                session=session,
-            )
-            return okresponse(message=f"{'liked' if like else 'disliked'}")
-
-    await adapter.insert(
-        CommentLike, {"user_id": user.id, "comment_id": comment_id, "like": like}, session=session
-    )
+            dislikes -= 1
+
+    if not existing_like or existing_like[0].like != like:
+        await adapter.insert(
+            CommentLike,
+            {"user_id": user.id, "comment_id": comment_id, "like": like},
+            session=session,
+        )
 
-    if like:
-        comment.likes += 1
-    else:
-        comment.dislikes += 1
+        if like:
+            likes += 1
+        else:
+            dislikes += 1
 
     await adapter.update_by_id(
-        Comment, comment_id, {"likes": comment.likes, "dislikes": comment.dislikes}, session=session
+        Comment,
+        comment_id,
+        {
+            "likes": func.greatest(Comment.likes + likes, 0),
+            "dislikes": func.greatest(Comment.dislikes + dislikes, 0),
+        },
+        session=session,
     )
+    await update_comment_score(comment, session)
+    await invalidate_comments(comment.video_id)
 
     return okresponse(message=f"{'liked' if like else 'disliked'}")
@@ -2,6 +2,7 @@ from typing import Annotated
 from uuid import UUID
 
 from app.api.comment.schemas import CommentCreate
+from app.api.comment.utils import invalidate_comments
 from app.database.adapter import adapter
 from app.database.models import Comment, User
 from app.database.session import get_async_session
@@ -29,4 +30,5 @@ async def edit_comment(
     if comment.user_id != user.id:
         raise HTTPException(403, "Forbidden")
     await adapter.update_by_id(Comment, comment_id, {"content": content.content}, session=session)
+    await invalidate_comments(comment.video_id)
     return okresponse()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -23,5 +23,10 @@ class CommentResponse(BaseModel):
     likes: int
     dislikes: int
     replies_count: int
+    score: float = 0
     is_liked_by_user: Optional[bool] = False
     is_disliked_by_user: Optional[bool] = False
+
+
+class CommentTreeResponse(CommentResponse):
+    children: List["CommentTreeResponse"] = []
@@ -0,0 +1,85 @@
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.api.comment.schemas import CommentResponse
+from app.core.settings import settings
+from app.database.adapter import adapter
+from app.database.models import Comment, Video
+from app.utils.response_cache import response_cache
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def wilson_lower_bound(likes: int, dislikes: int) -> float:
+    n = likes + dislikes
+    if n == 0:
+        return 0.0
+    z = settings.comment_settings.comment_score_confidence
+    p = likes / n
+    return (p + z * z / (2 * n) - z * math.sqrt((p * (1 - p) + z * z / (4 * n)) / n)) / (
+        1 + z * z / n
+    )
+
+
+def comment_score(likes: int, dislikes: int, created_at: datetime) -> float:
+    # asyncpg stores naive datetimes as UTC, read them back the same way
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    votes = (likes + dislikes) * wilson_lower_bound(likes, dislikes)
+    age = created_at.timestamp() / settings.comment_settings.comment_score_decay_seconds
+    return math.log10(1 + votes) + age
+
+
+@response_cache.cached("comments", ttl=settings.cache_settings.cache_comments_ttl)
+async def load_root_comments(video_id: Any, sort: str) -> Optional[List[Dict[str, Any]]]:
+    async with adapter.primary_session() as session:
+        video = await adapter.get_by_id(Video, video_id, session=session)
+        if not video:
+            return None
+        rows = await adapter.get_root_comments(
+            video_id,
+            None,
+            sort=sort,
+            limit=settings.cache_settings.cache_comments_page_size,
+            session=session,
+        )
+    return [
+        CommentResponse.model_validate(comment, from_attributes=True).model_dump(mode="json")
+        for comment, _ in rows
+    ]
+
+
+async def invalidate_comments(video_id: Any) -> None:
+    for sort in ("new", "top"):
+        await load_root_comments.invalidate(video_id, sort)
+
+
+async def update_comment_score(comment: Comment, session: AsyncSession) -> None:
+    await session.refresh(comment)
+    # Only applies while the counts are unchanged, a later vote writes its own newer score
+    await adapter.update_by_value(
+        Comment,
+        {"id": comment.id, "likes": comment.likes, "dislikes": comment.dislikes},
+        {"score": comment_score(comment.likes, comment.dislikes, comment.created_at)},
+        session=session,
+    )
+
+
+async def backfill_comment_scores() -> None:
+    async with adapter.SessionLocal() as s:
+        result = await s.stream(
+            select(Comment.id, Comment.likes, Comment.dislikes, Comment.created_at)
+        )
+        async for rows in result.partitions(1000):
+            await s.execute(
+                update(Comment),
+                [
+                    {"id": id, "score": comment_score(likes, dislikes, created_at)}
+                    for id, likes, dislikes, created_at in rows
+                ],
+            )
+        await s.commit()
+
+
+adapter.add_backfill(Comment.score, backfill_comment_scores)
@@ -1,6 +1,7 @@
 from typing import Annotated
 
 from app.api.user.schemas import UserResponse
+from app.api.user.utils import load_user, load_user_id
 from app.database.adapter import adapter
 from app.database.models import Subscription, User
 from app.database.session import get_async_session
@@ -20,13 +21,13 @@ async def get_user(
 ):
     if not username.startswith("@"):
         username = f"@{username}"
-    user_bd = await adapter.get_by_value(User, "username", username, session=session)
+    user_id = await load_user_id(username)
+    user_bd = await load_user(user_id) if user_id else None
     if not user_bd:
         raise HTTPException(404, "User not found")
-    user_bd = user_bd[0]
-    response = UserResponse.model_validate(user_bd, from_attributes=True)
+    response = UserResponse.model_validate(user_bd)
     sub = await adapter.get_by_values(
-        Subscription, {"subscriber_id": user.id, "subscribed_to_id": user_bd.id}, session=session
+        Subscription, {"subscriber_id": user.id, "subscribed_to_id": response.id}, session=session
     )
     if sub:
         response.is_subscribed = True
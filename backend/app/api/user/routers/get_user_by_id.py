@@ -2,6 +2,7 @@ from typing import Annotated
 from uuid import UUID
 
 from app.api.user.schemas import UserResponse
+from app.api.user.utils import load_user
 from app.database.adapter import adapter
 from app.database.models import Subscription, User
 from app.database.session import get_async_session
@@ -19,12 +20,12 @@ async def get_user(
     user: Annotated[User, Depends(check_user_token)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ):
-    user_bd = await adapter.get_by_id(User, id, session=session)
+    user_bd = await load_user(id)
     if not user_bd:
         raise HTTPException(404, "User not found")
-    response = UserResponse.model_validate(user_bd, from_attributes=True)
+    response = UserResponse.model_validate(user_bd)
     sub = await adapter.get_by_values(
-        Subscription, {"subscriber_id": user.id, "subscribed_to_id": user_bd.id}, session=session
+        Subscription, {"subscriber_id": user.id, "subscribed_to_id": id}, session=session
     )
     if sub:
         response.is_subscribed = True
@@ -6,8 +6,10 @@ from app.database.models import Subscription, User
 from app.database.session import get_async_session
 from app.dependencies.checks import check_user_token
 from app.dependencies.responses import emptyresponse, okresponse
+from app.utils.feed_timeline import feed_timeline
 from fastapi import APIRouter, Depends
 from fastapi.exceptions import HTTPException
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -30,22 +32,25 @@ async def subscribe(
             "subscriber_id": user.id,
             "subscribed_to_id": uuid,
         },
+        session=session,
     )
     if ex_subscription:
-        ex_subscription = ex_subscription[0]
-        await adapter.delete(Subscription, ex_subscription.id, session=session)
+        # Subscription has a composite key, so adapter.delete by id does not apply
+        await session.delete(ex_subscription[0])
+        await session.commit()
         await adapter.update_by_id(
             User,
             uuid,
-            {"followers_count": max(user_db.followers_count - 1, 0)},
+            {"followers_count": func.greatest(User.followers_count - 1, 0)},
             session=session,
         )
         await adapter.update_by_id(
             User,
             user.id,
-            {"subscriptions_count": max(user.subscriptions_count - 1, 0)},
+            {"subscriptions_count": func.greatest(User.subscriptions_count - 1, 0)},
             session=session,
         )
+        await feed_timeline.invalidate(user.id)
         return emptyresponse()
     await adapter.insert(
         Subscription,
@@ -56,9 +61,10 @@ async def subscribe(
         session=session,
     )
     await adapter.update_by_id(
-        User, uuid, {"followers_count": user_db.followers_count + 1}, session=session
+        User, uuid, {"followers_count": User.followers_count + 1}, session=session
     )
     await adapter.update_by_id(
-        User, user.id, {"subscriptions_count": user.subscriptions_count + 1}, session=session
+        User, user.id, {"subscriptions_count": User.subscriptions_count + 1}, session=session
     )
+    await feed_timeline.invalidate(user.id)
     return okresponse("Subscribed successfully")
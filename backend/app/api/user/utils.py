@@ -1,6 +1,12 @@
 import io
+from typing import Any, Dict, List, Optional, Set
 
+from app.api.user.schemas import UserResponse
 from app.core.logging import get_logger
+from app.core.settings import settings
+from app.database.adapter import adapter
+from app.database.models import User
+from app.utils.response_cache import response_cache
 from fastapi import UploadFile
 from PIL import Image
 
@@ -23,3 +29,27 @@ def process_image(file: UploadFile) -> bytes:
     img.save(buffer, format="PNG")
     buffer.seek(0)
     return buffer
+
+
+@response_cache.cached("user", ttl=settings.cache_settings.cache_user_ttl)
+async def load_user(user_id: Any) -> Optional[Dict[str, Any]]:
+    async with adapter.primary_session() as session:
+        user = await adapter.get_by_id(User, user_id, session=session)
+    if not user:
+        return None
+    return UserResponse.model_validate(user, from_attributes=True).model_dump(mode="json")
+
+
+@response_cache.cached("username", ttl=settings.cache_settings.cache_user_ttl)
+async def load_user_id(username: str) -> Optional[str]:
+    async with adapter.primary_session() as session:
+        users = await adapter.get_by_value(User, "username", username, session=session)
+    return str(users[0].id) if users else None
+
+
+async def invalidate_users(user_ids: List[Any], fields: Optional[Set[str]]) -> None:
+    for user_id in user_ids:
+        await load_user.invalidate(user_id)
+
+
+adapter.add_listener(User, invalidate_users)
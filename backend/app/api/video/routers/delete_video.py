@@ -4,6 +4,7 @@ from typing import Annotated
 from urllib.parse import urlparse
 from uuid import UUID
 
+from app.api.video.utils import load_user_videos
 from app.core.settings import settings
 from app.database.adapter import adapter
 from app.database.models import User, Video
@@ -12,6 +13,7 @@ from app.dependencies.checks import check_user_token
 from app.dependencies.responses import emptyresponse
 from app.dependencies.s3_buckets import get_s3_b2
 from app.utils.s3_adapter import S3HttpxSigV4Adapter
+from app.utils.video_sampler import video_sampler
 from fastapi import APIRouter, Depends
 from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -47,4 +49,6 @@ async def delete_video(
     await s3.delete_file(filepath)
     logger.info(filepath)
     await adapter.delete(Video, uuid, session=session)
+    await video_sampler.remove(uuid)
+    await load_user_videos.invalidate(user.id)
     return emptyresponse()
@@ -0,0 +1,35 @@
+from typing import Annotated
+
+from app.api.video.schemas import PrefetchHint, VideoBatchResponse
+from app.api.video.utils import build_video_response
+from app.core.settings import settings
+from app.database.models import User
+from app.database.session import get_async_session
+from app.dependencies.checks import check_user_token
+from app.utils.video_sampler import video_sampler
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter()
+
+
+@router.get("/get-video-batch", response_model=VideoBatchResponse)
+async def get_video_batch(
+    user: Annotated[User, Depends(check_user_token)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    count: int = Query(5, ge=1, le=settings.feed_settings.feed_batch_max_size),
+):
+    rows = await video_sampler.pick_videos(user.id, count, session=session)
+    if not rows:
+        raise HTTPException(status_code=404, detail="No videos found")
+
+    videos = [build_video_response(*row) for row in rows]
+    prefetch = [
+        PrefetchHint(
+            video_id=video.id,
+            serv_url=video.serv_url,
+            range=f"bytes=0-{settings.feed_settings.feed_prefetch_bytes - 1}",
+        )
+        for video in videos
+    ]
+    return VideoBatchResponse(videos=videos, prefetch=prefetch)
@@ -2,10 +2,10 @@ from typing import Annotated
 from uuid import UUID
 
 from app.api.video.schemas import VideoResponse
+from app.api.video.utils import load_video
 from app.core.logging import get_logger
-from app.core.settings import settings
 from app.database.adapter import adapter
-from app.database.models import Like, User, Video
+from app.database.models import Like, User
 from app.database.session import get_async_session
 from app.dependencies.checks import check_user_token
 from fastapi import APIRouter, Depends, HTTPException
@@ -24,30 +24,20 @@ async def get_video(
     user: Annotated[User, Depends(check_user_token)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ):
-    video = await adapter.get_by_id(Video, uuid, session=session)
+    video = await load_video(uuid)
 
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    author = await session.get(User, video.author_id)
-    if not author:
-        raise HTTPException(status_code=404, detail="Author not found")
-
     like_objs = await adapter.get_by_values(
         Like,
-        {"user_id": user.id, "video_id": video.id},
+        {"user_id": user.id, "video_id": uuid},
         session=session,
     )
     like_obj = like_objs[0] if like_objs else None
 
-    liked = like_obj.like is True if like_obj else False
-    disliked = like_obj.like is False if like_obj else False
-
-    response = VideoResponse.model_validate(video, from_attributes=True)
-    response.serv_url = f"{settings.backend_url}/stream-video/{video.id}"
-    response.author_name = author.name
-    response.author_username = author.username
-    response.is_liked_by_user = liked
-    response.is_disliked_by_user = disliked
+    response = VideoResponse.model_validate(video)
+    response.is_liked_by_user = like_obj.like is True if like_obj else False
+    response.is_disliked_by_user = like_obj.like is False if like_obj else False
 
     return response
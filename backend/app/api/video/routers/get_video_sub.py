@@ -1,14 +1,17 @@
-from random import choice
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, List, Optional
 
 from app.api.video.schemas import VideoResponse
+from app.api.video.utils import build_video_response
 from app.core.logging import get_logger
 from app.core.settings import settings
 from app.database.adapter import adapter
-from app.database.models import Like, Subscription, User, Video
+from app.database.models import User
 from app.database.session import get_async_session
 from app.dependencies.checks import check_user_token
-from fastapi import APIRouter, Depends, HTTPException
+from app.utils.feed_timeline import feed_timeline
+from app.utils.seen_filter import seen_filter
+from fastapi import APIRouter, Depends, Query
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,42 +21,26 @@ Bear = HTTPBearer(auto_error=False)
 logger = get_logger()
 
 
-@router.get("/get-video-subcribed", response_model=VideoResponse)
+@router.get("/get-video-subcribed", response_model=List[VideoResponse])
 async def get_video_subscribed(
     user: Annotated[User, Depends(check_user_token)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
+    limit: int = Query(10, ge=1, le=50),
+    before: Optional[datetime] = None,
+    unseen_only: bool = False,
 ):
-    subscriptions = await adapter.get_by_value(
-        Subscription, "subscriber_id", user.id, session=session
-    )
-    sub_list = [sub.subscribed_to_id for sub in subscriptions]
-    video_list = []
-    for sub in sub_list:
-        video = await adapter.get_by_value(Video, "author_id", sub, session=session)
-        if video:
-            video_list.append(video)
-    if not video_list:
-        raise HTTPException(404, "Videos not found")
-    rand = choice(video_list)
-    author = await adapter.get_by_id(User, rand.author_id, session=session)
-    if not author:
-        raise HTTPException(status_code=404, detail="Author not found")
-
-    like_objs = await adapter.get_by_values(
-        Like,
-        {"user_id": user.id, "video_id": rand.id},
-        session=session,
-    )
-    like_obj = like_objs[0] if like_objs else None
-
-    liked = like_obj.like is True if like_obj else False
-    disliked = like_obj.like is False if like_obj else False
-
-    response = VideoResponse.model_validate(rand, from_attributes=True)
-    response.serv_url = f"{settings.backend_url}/stream-video/{rand.id}"
-    response.author_name = author.name
-    response.author_username = author.username
-    response.is_liked_by_user = liked
-    response.is_disliked_by_user = disliked
-
-    return response
+    rows = None
+    if user.subscriptions_count >= settings.feed_settings.feed_timeline_min_subscriptions:
+        video_ids = await feed_timeline.get_page(user.id, limit, before)
+        if video_ids is not None:
+            rows = await adapter.get_videos_with_author(video_ids, user.id, session=session)
+            rows.sort(key=lambda row: (row[0].created_at, row[0].id), reverse=True)
+
+    if rows is None:
+        rows = await adapter.get_subscription_feed(user.id, limit, before, session=session)
+
+    if unseen_only:
+        unseen_ids = set(await seen_filter.filter_unseen(user.id, [row[0].id for row in rows]))
+        rows = [row for row in rows if row[0].id in unseen_ids]
+
+    return [build_video_response(*row) for row in rows]
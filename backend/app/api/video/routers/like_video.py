@@ -1,19 +1,29 @@
 from typing import Annotated
 from uuid import UUID
 
+from app.core.settings import settings
 from app.database.adapter import adapter
 from app.database.models import Like, User, Video
 from app.database.session import get_async_session
 from app.dependencies.checks import check_user_token
+from app.dependencies.rate_limit import RateLimiter
 from app.dependencies.responses import okresponse
 from fastapi import APIRouter, Depends, Query
 from fastapi.exceptions import HTTPException
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 
-@router.post("/like-video")
+@router.post(
+    "/like-video",
+    dependencies=[
+        Depends(
+            RateLimiter("like_video", settings.rate_limit_settings.rate_limit_like_video, "user")
+        )
+    ],
+)
 async def like_video(
     uuid: UUID,
     user: Annotated[User, Depends(check_user_token)],
@@ -28,32 +38,34 @@ async def like_video(
         Like, {"user_id": user.id, "video_id": uuid}, session=session
     )
 
+    likes = dislikes = 0
     if existing_like:
         prev_like = existing_like[0]
         await adapter.delete(Like, prev_like.id, session=session)
 
         if prev_like.like:
-            video.likes = max(video.likes - 1, 0)
+            likes -= 1
         else:
-            video.dislikes = max(video.dislikes - 1, 0)
+            dislikes -= 1
 
-        if prev_like.like == like:
-            await adapter.update_by_id(
-                Video, uuid, {"likes": video.likes, "dislikes": video.dislikes}, session=session
-            )
-            return okresponse(message=f"{'liked' if like else 'disliked'}")
+    if not existing_like or existing_like[0].like != like:
+        await adapter.insert(
+            Like, {"user_id": user.id, "video_id": uuid, "like": like}, session=session
+        )
 
-    await adapter.insert(
-        Like, {"user_id": user.id, "video_id": uuid, "like": like}, session=session
-    )
-
-    if like:
-        video.likes += 1
-    else:
-        video.dislikes += 1
+        if like:
+            likes += 1
+        else:
+            dislikes += 1
 
     await adapter.update_by_id(
-        Video, uuid, {"likes": video.likes, "dislikes": video.dislikes}, session=session
+        Video,
+        uuid,
+        {
+            "likes": func.greatest(Video.likes + likes, 0),
+            "dislikes": func.greatest(Video.dislikes + dislikes, 0),
+        },
+        session=session,
     )
 
     return okresponse(message=f"{'liked' if like else 'disliked'}")
@@ -0,0 +1,32 @@
+from typing import Annotated, List, Optional
+from uuid import UUID
+
+from app.api.video.schemas import VideoSearchResponse
+from app.api.video.utils import build_video_response
+from app.database.adapter import adapter
+from app.database.models import User
+from app.database.session import get_async_session
+from app.dependencies.checks import check_user_token
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter()
+
+
+@router.get("/search-videos", response_model=List[VideoSearchResponse])
+async def search_videos(
+    user: Annotated[User, Depends(check_user_token)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    after_rank: Optional[float] = None,
+    after_id: Optional[UUID] = None,
+):
+    rows = await adapter.search_videos(
+        q, user.id, limit, after_rank=after_rank, after_id=after_id, session=session
+    )
+    result = []
+    for video, author_name, author_username, like, rank in rows:
+        response = build_video_response(video, author_name, author_username, like)
+        result.append(VideoSearchResponse(**response.model_dump(), rank=rank))
+    return result
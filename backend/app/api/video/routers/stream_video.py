@@ -1,14 +1,16 @@
 import mimetypes
-from typing import Annotated
+from typing import Annotated, Optional
 from uuid import UUID
 
 import requests
+from app.api.video.utils import is_prefetch_range
 from app.database.adapter import adapter
 from app.database.models import User, Video, View
 from app.database.session import get_async_session
 from app.dependencies.checks import check_user_token
 from app.dependencies.responses import badresponse
-from fastapi import APIRouter, Depends
+from app.utils.seen_filter import seen_filter
+from fastapi import APIRouter, Depends, Header
 from fastapi.exceptions import HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,6 +23,7 @@ async def stream_by_uuid(
     uuid: UUID,
     user: Annotated[User, Depends(check_user_token)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
+    range_header: Annotated[Optional[str], Header(alias="range")] = None,
 ):
     video = await adapter.get_by_id(Video, uuid, session=session)
     if not video:
@@ -30,18 +33,23 @@ async def stream_by_uuid(
     if not mime_type:
         mime_type = "application/octet-stream"
 
-    r = requests.get(video.url, stream=True)
+    # Forward Range so prefetch hints and seeking get a 206 from the bucket
+    upstream_headers = {"Range": range_header} if range_header else {}
+    r = requests.get(video.url, stream=True, headers=upstream_headers)
 
     if r.status_code not in (200, 206):
         return badresponse("Media not accessible", r.status_code)
 
-    view = await adapter.get_by_values(
-        View, {"user_id": user.id, "video_id": uuid}, session=session
-    )
-    if not view:
-        await adapter.insert(View, {"user_id": user.id, "video_id": uuid}, session=session)
-        views = video.views + 1
-        await adapter.update_by_id(Video, uuid, {"views": views}, session=session)
+    if not is_prefetch_range(range_header):
+        # Counting a view is a write, so check for an existing one on the primary
+        session.info["primary"] = True
+        view = await adapter.get_by_values(
+            View, {"user_id": user.id, "video_id": uuid}, session=session
+        )
+        if not view:
+            await adapter.insert(View, {"user_id": user.id, "video_id": uuid}, session=session)
+            await adapter.update_by_id(Video, uuid, {"views": Video.views + 1}, session=session)
+        await seen_filter.add(user.id, uuid)
 
     response_headers = {
         "Content-Length": r.headers.get("Content-Length", ""),
@@ -2,6 +2,7 @@ from typing import Annotated
 from uuid import UUID
 
 from app.api.video.schemas import UpdateVideoContent
+from app.api.video.utils import load_user_videos
 from app.database.adapter import adapter
 from app.database.models import User, Video
 from app.database.session import get_async_session
@@ -30,4 +31,5 @@ async def update_video(
         raise HTTPException(403, "Forbidden")
     video_dict = UpdateVideoContent.model_dump(content)
     await adapter.update_by_id(Video, uuid, video_dict, session=session)
+    await load_user_videos.invalidate(user.id)
     return okresponse()
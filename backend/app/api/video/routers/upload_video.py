@@ -4,15 +4,18 @@ from typing import Annotated, Optional
 
 from app.api.video.schemas import VideoCreateResponse
 from app.api.video.tasks import process_video_task
+from app.api.video.utils import load_user_videos
 from app.core.logging import get_logger
 from app.core.settings import settings
 from app.database.adapter import adapter
 from app.database.models import User, Video
 from app.database.session import get_async_session
 from app.dependencies.checks import check_user_token
+from app.dependencies.rate_limit import RateLimiter
 from app.dependencies.responses import badresponse
 from app.dependencies.s3_buckets import get_s3_b2
 from app.utils.s3_adapter import S3HttpxSigV4Adapter
+from app.utils.video_sampler import video_sampler
 from fastapi import APIRouter, Depends, File, Form, UploadFile
 from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,7 +27,18 @@ logger = get_logger()
 ALLOWED_EXTENSIONS = {".mp4", ".mov", ".webm", ".avi", ".mkv", ".flv", ".wmv", ".m4v"}
 
 
-@router.post("/upload-video", response_model=VideoCreateResponse, status_code=201)
+@router.post(
+    "/upload-video",
+    response_model=VideoCreateResponse,
+    status_code=201,
+    dependencies=[
+        Depends(
+            RateLimiter(
+                "upload_video", settings.rate_limit_settings.rate_limit_upload_video, "user"
+            )
+        )
+    ],
+)
 async def upload_video(
     user: Annotated[User, Depends(check_user_token)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
@@ -65,6 +79,8 @@ async def upload_video(
             },
             session=session,
         )
+        await video_sampler.add(uuid)
+        await load_user_videos.invalidate(user.id)
 
         return VideoCreateResponse(
             url=f"{settings.backend_url}/stream-video/{uuid}", uuid=str(uuid)
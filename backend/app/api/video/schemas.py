@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -29,5 +29,20 @@ class VideoResponse(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
+class VideoSearchResponse(VideoResponse):
+    rank: float
+
+
+class PrefetchHint(BaseModel):
+    video_id: UUID
+    serv_url: str
+    range: str
+
+
+class VideoBatchResponse(BaseModel):
+    videos: List[VideoResponse]
+    prefetch: List[PrefetchHint]
+
+
 class UpdateVideoContent(BaseModel):
     description: str
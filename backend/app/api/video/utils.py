@@ -1,8 +1,15 @@
 import os
+import re
 import tempfile
+from typing import Any, Dict, List, Optional, Set
 
 import cv2
 import numpy as np
+from app.api.video.schemas import VideoResponse
+from app.core.settings import settings
+from app.database.adapter import adapter
+from app.database.models import User, Video
+from app.utils.response_cache import response_cache
 from moviepy.editor import VideoFileClip
 
 
@@ -91,3 +98,76 @@ def gen_blur_sync(input_path: str, target_resolution=(1080, 1920)) -> str:
         clip.close()
         if "processed" in locals():
             del processed
+
+
+def build_video_response(
+    video: Video, author_name: str, author_username: str, like: Optional[bool]
+) -> VideoResponse:
+    response = VideoResponse.model_validate(video, from_attributes=True)
+    response.serv_url = f"{settings.backend_url}/stream-video/{video.id}"
+    response.author_name = author_name
+    response.author_username = author_username
+    response.is_liked_by_user = like is True
+    response.is_disliked_by_user = like is False
+    return response
+
+
+VIDEO_COUNTER_FIELDS = {"views", "likes", "dislikes", "comments"}
+
+PREFETCH_RANGE_RE = re.compile(r"bytes=0-(\d+)")
+
+
+def is_prefetch_range(range_header: Optional[str]) -> bool:
+    # Feed prefetch hints only fetch the head of the file, nobody has watched it yet
+    if not range_header:
+        return False
+    match = PREFETCH_RANGE_RE.fullmatch(range_header.strip())
+    return match is not None and int(match.group(1)) < settings.feed_settings.feed_prefetch_bytes
+
+
+@response_cache.cached("video", ttl=settings.cache_settings.cache_video_ttl)
+async def load_video(video_id: Any) -> Optional[Dict[str, Any]]:
+    async with adapter.primary_session() as session:
+        rows = await adapter.get_videos_with_author([video_id], None, session=session)
+    if not rows:
+        return None
+    video, author_name, author_username, _ = rows[0]
+    return build_video_response(video, author_name, author_username, None).model_dump(mode="json")
+
+
+@response_cache.cached("user_videos", ttl=settings.cache_settings.cache_user_videos_ttl)
+async def load_user_videos(author_id: Any) -> Optional[List[Dict[str, Any]]]:
+    async with adapter.primary_session() as session:
+        author = await adapter.get_by_id(User, author_id, session=session)
+        if not author:
+            return None
+        videos = await adapter.get_by_value(Video, "author_id", author_id, session=session)
+    return [
+        build_video_response(video, author.name, author.username, None).model_dump(mode="json")
+        for video in videos
+    ]
+
+
+async def invalidate_videos(video_ids: List[Any], fields: Optional[Set[str]]) -> None:
+    # Counters change on every view/like; leave them to the cache TTL
+    if fields is not None and fields <= VIDEO_COUNTER_FIELDS:
+        return
+    for video_id in video_ids:
+        await load_video.invalidate(video_id)
+
+
+AUTHOR_FIELDS = {"name", "username"}
+
+
+async def invalidate_author_videos(user_ids: List[Any], fields: Optional[Set[str]]) -> None:
+    # Cached videos embed the author's name and username
+    if fields is not None and not fields & AUTHOR_FIELDS:
+        return
+    for user_id in user_ids:
+        for video in await adapter.get_by_value(Video, "author_id", user_id):
+            await load_video.invalidate(video.id)
+        await load_user_videos.invalidate(user_id)
+
+
+adapter.add_listener(Video, invalidate_videos)
+adapter.add_listener(User, invalidate_author_videos)
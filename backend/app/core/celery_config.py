@@ -1,4 +1,5 @@
 from app.core.logging import get_logger
+from app.core.metrics import instrument_celery
 from app.core.settings import settings
 from celery import Celery
 
@@ -14,3 +15,4 @@ celery_app = Celery(
 
 celery_app.autodiscover_tasks(packages=["app.api.auth"])
 celery_app.autodiscover_tasks(packages=["app.api.video"])
+instrument_celery(celery_app)
@@ -1,55 +1,89 @@
 import json
 import logging
-from time import time
+import random
+from time import perf_counter
+from urllib.parse import parse_qsl
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from app.core.settings import settings
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger("app.request")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        body = await request.body()
-        content_type = request.headers.get("content-type", "")
+class LoggingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.body_sample_rate = settings.log_settings.log_body_sample_rate
+        self.body_max_bytes = settings.log_settings.log_body_max_bytes
+        self.body_content_types = tuple(settings.log_settings.log_body_content_types)
+
+    def _capturable(self, headers: Headers) -> bool:
+        content_type = headers.get("content-type", "")
+        content_length = headers.get("content-length")
+        return (
+            content_type.startswith(self.body_content_types)
+            and content_length is not None
+            and content_length.isdigit()
+            and int(content_length) <= self.body_max_bytes
+        )
+
+    @staticmethod
+    def _decode(body: bytes):
         try:
-            if "application/json" in content_type or "text" in content_type:
-                body_str = body.decode("utf-8")
-            else:
-                body_str = f"<binary {len(body)} bytes>"
-        except UnicodeDecodeError:
-            body_str = f"<undecodable {len(body)} bytes>"
-
-        start = time()
-        response: Response = await call_next(request)
-        duration = round((time() - start) * 1000, 2)
-
-        log_data = {
-            "method": request.method,
-            "path": request.url.path,
-            "query": dict(request.query_params),
-            "request_body": body_str,
-            "status_code": response.status_code,
-            "duration_ms": duration,
-        }
-
-        if response.headers.get("content-type", "").startswith("application/json"):
-            response_body = b""
-            async for chunk in response.body_iterator:
-                response_body += chunk
-
-            async def new_body_iterator():
-                yield response_body
-
-            response.body_iterator = new_body_iterator()
+            return json.loads(body)
+        except ValueError:
             try:
-                log_data["response_body"] = json.loads(response_body.decode())
-            except Exception:
-                try:
-                    log_data["response_body"] = response_body.decode()
-                except:  # noqa
-                    log_data["response_body"] = f"<undecodable {len(response_body)} bytes>"
-
-        logger.info(json.dumps(log_data, ensure_ascii=False))
-        return response
+                return body.decode("utf-8")
+            except UnicodeDecodeError:
+                return f"<undecodable {len(body)} bytes>"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        sampled = self.body_sample_rate > 0 and random.random() < self.body_sample_rate
+        capture_request = sampled and self._capturable(Headers(scope=scope))
+        capture_response = False
+        request_body = bytearray()
+        response_body = bytearray()
+        status_code = 500
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if capture_request and message["type"] == "http.request":
+                request_body.extend(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, capture_response
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                capture_response = sampled and self._capturable(Headers(raw=message["headers"]))
+            elif capture_response and message["type"] == "http.response.body":
+                response_body.extend(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            log_data = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": dict(parse_qsl(scope["query_string"].decode("latin-1"))),
+                "status_code": status_code,
+                "duration_ms": round((perf_counter() - start) * 1000, 2),
+            }
+            if capture_request:
+                log_data["request_body"] = self._decode(bytes(request_body))
+            if capture_response:
+                log_data["response_body"] = self._decode(bytes(response_body))
+            logger.info(
+                "%s %s %s",
+                log_data["method"],
+                log_data["path"],
+                status_code,
+                extra={"data": log_data},
+            )
@@ -1,30 +1,74 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 
-from colorlog import ColoredFormatter
+from app.core.settings import settings
 
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
 LOG_FORMAT = "[%(asctime)s] [%(levelname)s] [%(name)s:%(lineno)d] - %(message)s"
 
+log_listener: Optional[QueueListener] = None
 
-def setup_logging():
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    logger.handlers.clear()
 
-    file_handler = RotatingFileHandler(
-        LOG_DIR / "app.log",
-        maxBytes=5 * 1024 * 1024,
-        backupCount=5,
-        encoding="utf-8",
-    )
-    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+        }
+        if isinstance(getattr(record, "data", None), dict):
+            data.update(record.data)
+        else:
+            data["message"] = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
 
-    color_formatter = ColoredFormatter(
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The base class folds the traceback into msg; keep it in exc_text for the formatters
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self.exception_formatter.formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _console_formatter() -> logging.Formatter:
+    if not settings.log_settings.log_console_color:
+        return JsonFormatter() if settings.log_settings.log_json else logging.Formatter(LOG_FORMAT)
+
+    from colorlog import ColoredFormatter
+
+    return ColoredFormatter(
         "%(log_color)s" + LOG_FORMAT,
         log_colors={
             "DEBUG": "cyan",
@@ -34,19 +78,61 @@ def setup_logging():
             "CRITICAL": "bold_red",
         },
     )
+
+
+def stop_logging():
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+
+def setup_logging():
+    global log_listener
+    stop_logging()
+
+    logger = logging.getLogger()
+    logger.setLevel(settings.log_settings.log_level)
+    logger.handlers.clear()
+
+    file_handler = RotatingFileHandler(
+        LOG_DIR / "app.log",
+        maxBytes=5 * 1024 * 1024,
+        backupCount=5,
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(
+        JsonFormatter() if settings.log_settings.log_json else logging.Formatter(LOG_FORMAT)
+    )
+
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(color_formatter)
+    console_handler.setFormatter(_console_formatter())
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # File and console I/O happen on the listener thread, never on the event loop
+    queue_handler = DroppingQueueHandler(queue.Queue(settings.log_settings.log_queue_size))
+    log_listener = QueueListener(
+        queue_handler.queue, file_handler, console_handler, respect_handler_level=True
+    )
+    log_listener.start()
+    logger.addHandler(queue_handler)
 
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
 
-def get_logger(name: str = None) -> logging.Logger:
-    import inspect
+def dropped_log_records() -> int:
+    return sum(
+        handler.dropped
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, DroppingQueueHandler)
+    )
+
+
+atexit.register(stop_logging)
 
-    frame = inspect.stack()[1]
-    module = inspect.getmodule(frame[0])
-    return logging.getLogger(module.__name__ if module else "__main__")
+
+def get_logger(name: str = None) -> logging.Logger:
+    if name is None:
+        # Only the caller's frame is needed, not source context for the whole stack
+        name = sys._getframe(1).f_globals.get("__name__", "__main__")
+    return logging.getLogger(name)
@@ -0,0 +1,271 @@
+import asyncio
+import hmac
+import os
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional
+
+import redis.asyncio as redis
+from app.core.logging import get_logger
+from app.core.settings import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = get_logger()
+
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SIZE = Histogram(
+    "http_request_size_bytes", "HTTP request body size", ["method", "route"], buckets=SIZE_BUCKETS
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests in progress", multiprocess_mode="livesum"
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections checked out of the pool", multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Pool overflow connections in use", multiprocess_mode="livesum"
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection", buckets=FAST_BUCKETS
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds", "SQL statement latency", ["operation"], buckets=FAST_BUCKETS
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds", "Redis command latency", ["command"], buckets=FAST_BUCKETS
+)
+REDIS_COMMAND_ERRORS = Counter("redis_command_errors_total", "Failed Redis commands", ["command"])
+
+S3_REQUEST_DURATION = Histogram(
+    "s3_request_duration_seconds", "S3 request latency until headers", ["method", "status"]
+)
+
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task runtime",
+    ["task", "state"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800),
+)
+CELERY_QUEUE_LENGTH = Gauge(
+    "celery_queue_length", "Messages waiting in a Celery queue", ["queue"], multiprocess_mode="max"
+)
+
+APP_STAT = Gauge(
+    "app_stat",
+    "In-process counters from caches and pools",
+    ["source", "key"],
+    multiprocess_mode="livesum",
+)
+
+stat_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+routes_by_endpoint: Dict[Any, str] = {}
+
+
+def register_stats(source: str, collect: Callable[[], Dict[str, Any]]) -> None:
+    stat_sources[source] = collect
+
+
+async def refresh_stats() -> None:
+    # Each worker publishes its own numbers; livesum adds them up across live workers
+    while True:
+        for source, collect in stat_sources.items():
+            try:
+                for key, value in collect().items():
+                    if isinstance(value, (int, float)):
+                        APP_STAT.labels(source, key).set(value)
+            except Exception as e:
+                logger.exception(f"Stats source {source} error: {e}")
+        await asyncio.sleep(settings.metrics_settings.metrics_stats_interval)
+
+
+def _route_template(scope: Scope) -> str:
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "<unmatched>"
+    if not routes_by_endpoint:
+        for route in scope["app"].routes:
+            routes_by_endpoint[getattr(route, "endpoint", None)] = getattr(route, "path", "")
+    return routes_by_endpoint.get(endpoint, "<unmatched>")
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status_code = 500
+        request_size = 0
+        response_size = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_length = Headers(raw=message["headers"]).get("content-length")
+                if content_length and content_length.isdigit():
+                    response_size = int(content_length)
+            elif message["type"] == "http.response.body" and not response_size:
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = _route_template(scope)
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.labels(method, route, status_code).observe(perf_counter() - start)
+            HTTP_REQUEST_SIZE.labels(method, route).observe(request_size)
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(response_size)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(perf_counter() - start)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    def update_overflow(returning: int = 0) -> None:
+        pool = sync_engine.pool
+        if not isinstance(pool, QueuePool):
+            return
+        # checkin fires before the pool takes the connection back, so it is still counted
+        DB_POOL_OVERFLOW.set(max(pool.checkedout() - returning - pool.size(), 0))
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+        update_overflow()
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+        update_overflow(returning=1)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_start", None)
+        if started is None:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        DB_STATEMENT_DURATION.labels(operation).observe(perf_counter() - started)
+
+
+async def s3_request_hook(request: Any) -> None:
+    request.extensions["metrics_start"] = perf_counter()
+
+
+async def s3_response_hook(response: Any) -> None:
+    started = response.request.extensions.get("metrics_start")
+    if started is not None:
+        S3_REQUEST_DURATION.labels(response.request.method, response.status_code).observe(
+            perf_counter() - started
+        )
+
+
+def instrument_celery(celery_app: Any) -> None:
+    from celery.signals import task_postrun, task_prerun
+
+    started: Dict[str, float] = {}
+
+    @task_prerun.connect(weak=False)
+    def on_task_prerun(task_id: str = None, **kwargs):
+        started[task_id] = perf_counter()
+
+    @task_postrun.connect(weak=False)
+    def on_task_postrun(task_id: str = None, task: Any = None, state: str = None, **kwargs):
+        start = started.pop(task_id, None)
+        if start is not None:
+            CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+                perf_counter() - start
+            )
+
+
+async def _update_celery_queue_lengths() -> None:
+    client = redis.Redis.from_url(settings.redis_settings.celery_url)
+    try:
+        for queue in settings.metrics_settings.metrics_celery_queues:
+            length = await client.llen(queue)
+            CELERY_QUEUE_LENGTH.labels(queue).set(length)
+    except Exception as e:
+        logger.warning(f"Celery queue length error: {e}")
+    finally:
+        await client.close()
+
+
+def _registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    token = settings.metrics_settings.metrics_token
+    provided = request.headers.get("authorization", "").removeprefix("Bearer ")
+    if token is None or not hmac.compare_digest(
+        provided.encode(), token.get_secret_value().encode()
+    ):
+        return JSONResponse({"detail": "Not Found"}, status_code=404)
+
+    await _update_celery_queue_lengths()
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,206 @@
+import asyncio
+import hmac
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from time import monotonic, sleep
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.logging import LOG_DIR, get_logger
+from app.core.settings import settings
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = get_logger()
+
+PROFILE_DIR = LOG_DIR / "profiles"
+PROFILE_PATH = "/admin/profile"
+
+Frame = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.duration = 0.0
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack: List[Frame] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def run(self, seconds: float, stop: Optional[threading.Event] = None) -> "SamplingProfiler":
+        started = monotonic()
+        deadline = started + seconds
+        while monotonic() < deadline and not (stop and stop.is_set()):
+            self.sample()
+            sleep(self.interval)
+        self.duration = monotonic() - started
+        return self
+
+    def collapsed(self) -> str:
+        lines = []
+        for stack, count in self.stacks.most_common():
+            names = ";".join(f"{name} ({filename}:{line})" for name, filename, line in stack)
+            lines.append(f"{names} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        frames: List[Dict[str, Any]] = []
+        index: Dict[Frame, int] = {}
+        samples = []
+        weights = []
+        for stack, count in self.stacks.items():
+            sample = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                sample.append(index[frame])
+            samples.append(sample)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+class SlowRequestWatchdog:
+    def __init__(self):
+        self.thread_id = 0
+        self.threshold = settings.profiler_settings.slow_request_threshold_ms / 1000
+        self.cooldown = settings.profiler_settings.slow_request_capture_cooldown
+        self.max_seconds = settings.profiler_settings.slow_request_capture_max_seconds
+        self.interval = settings.profiler_settings.profiler_interval_ms / 1000
+        self.inflight: Dict[int, Tuple[float, str]] = {}
+        self.finished: Dict[int, threading.Event] = {}
+        self.last_capture = float("-inf")
+        self.captures = 0
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self, thread_id: int) -> None:
+        if self.thread is None:
+            self.thread_id = thread_id
+            self.thread = threading.Thread(target=self._watch, name="slow-request-watchdog")
+            self.thread.daemon = True
+            self.thread.start()
+
+    def begin(self, request_id: int, label: str) -> None:
+        with self.lock:
+            self.inflight[request_id] = (monotonic(), label)
+
+    def end(self, request_id: int) -> None:
+        with self.lock:
+            self.inflight.pop(request_id, None)
+            done = self.finished.pop(request_id, None)
+        if done is not None:
+            done.set()
+
+    def _watch(self) -> None:
+        # Runs off the event loop so it still fires when the loop itself is blocked
+        while True:
+            sleep(min(self.threshold / 4, 0.25))
+            now = monotonic()
+            if now - self.last_capture < self.cooldown:
+                continue
+            with self.lock:
+                slow = [
+                    (request_id, label)
+                    for request_id, (started, label) in self.inflight.items()
+                    if now - started >= self.threshold
+                ]
+                if not slow:
+                    continue
+                request_id, label = slow[0]
+                done = threading.Event()
+                self.finished[request_id] = done
+            self.last_capture = now
+            self._capture(label, done)
+
+    def _capture(self, label: str, done: threading.Event) -> None:
+        profiler = SamplingProfiler(self.thread_id, self.interval).run(self.max_seconds, done)
+        self.captures += 1
+        try:
+            PROFILE_DIR.mkdir(exist_ok=True)
+            safe_label = "".join(c if c.isalnum() else "_" for c in label)[:80]
+            path = PROFILE_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{safe_label}.collapsed"
+            path.write_text(profiler.collapsed(), encoding="utf-8")
+            logger.warning(
+                f"Slow request {label} exceeded {self.threshold * 1000:.0f}ms, "
+                f"profile with {profiler.samples} samples saved to {path}"
+            )
+        except Exception as e:
+            logger.exception(f"Slow request profile write error: {e}")
+
+
+class SlowRequestMiddleware:
+    def __init__(self, app: ASGIApp, watchdog: SlowRequestWatchdog):
+        self.app = app
+        self.watchdog = watchdog
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == PROFILE_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        self.watchdog.start(threading.get_ident())
+        request_id = id(scope)
+        self.watchdog.begin(request_id, f"{scope['method']} {scope['path']}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.watchdog.end(request_id)
+
+
+async def profile_endpoint(request: Request) -> Response:
+    token = settings.profiler_settings.profiler_token
+    provided = request.headers.get("x-profiler-token", "")
+    if token is None or not hmac.compare_digest(
+        provided.encode(), token.get_secret_value().encode()
+    ):
+        return JSONResponse({"detail": "Not Found"}, status_code=404)
+
+    try:
+        seconds = float(request.query_params.get("seconds", 10))
+    except ValueError:
+        return JSONResponse({"detail": "Invalid seconds"}, status_code=400)
+    seconds = min(max(seconds, 0.1), settings.profiler_settings.profiler_max_seconds)
+    output = request.query_params.get("format", "speedscope")
+
+    profiler = SamplingProfiler(
+        threading.get_ident(), settings.profiler_settings.profiler_interval_ms / 1000
+    )
+    await asyncio.to_thread(profiler.run, seconds)
+
+    if output == "collapsed":
+        return PlainTextResponse(profiler.collapsed())
+    return JSONResponse(profiler.speedscope(f"worker profile {seconds:.1f}s"))
+
+
+def install_profiler(app: Any) -> None:
+    app.add_route(PROFILE_PATH, profile_endpoint, include_in_schema=False)
+    if settings.profiler_settings.slow_request_threshold_ms > 0:
+        app.add_middleware(SlowRequestMiddleware, watchdog=SlowRequestWatchdog())
@@ -0,0 +1,108 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = get_logger()
+
+PARAMS_RE = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*|%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*|\?(?:\s*,\s*\?)*")
+SPACES_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return SPACES_RE.sub(" ", PARAMS_RE.sub("?", statement)).strip()
+
+
+class QueryTracker:
+    def __init__(self, parent: Optional["QueryTracker"] = None):
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement, duration)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+current_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("query_tracker", default=None)
+
+
+def track_queries(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_tracker.get() is not None:
+            context._tracker_start = perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        tracker = current_tracker.get()
+        started = getattr(context, "_tracker_start", None)
+        if tracker is not None and started is not None:
+            tracker.record(statement, perf_counter() - started)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryTracker]:
+    tracker = QueryTracker(parent=current_tracker.get())
+    token = current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        current_tracker.reset(token)
+    if tracker.count > max_queries:
+        shapes = "\n".join(f"{count}x {shape}" for shape, count in tracker.shapes.most_common())
+        raise AssertionError(
+            f"Query budget exceeded: {tracker.count} queries, budget {max_queries}\n{shapes}"
+        )
+
+
+class QueryTrackerMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.server_timing = settings.debug
+        self.repeat_threshold = settings.query_tracker_settings.query_repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = QueryTracker(parent=current_tracker.get())
+        token = current_tracker.set(tracker)
+
+        async def send_wrapper(message: Message) -> None:
+            if self.server_timing and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={tracker.duration * 1000:.2f};desc="{tracker.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_tracker.reset(token)
+            for shape, count in tracker.repeated(self.repeat_threshold):
+                logger.warning(
+                    f"Possible N+1 in {scope['method']} {scope['path']}: "
+                    f"{count} executions of {shape[:300]}"
+                )
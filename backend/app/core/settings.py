@@ -1,3 +1,5 @@
+from typing import Any, Dict, List, Literal, Optional
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,6 +10,18 @@ class DBSettings(BaseSettings):
     db_password: SecretStr
     db_host: str
     db_port: int
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = False
+    db_statement_cache_size: int = 100
+    db_statement_timeout_ms: int = 0
+    db_application_name: str = "backend"
+    db_replica_hosts: List[str] = []
+    db_replica_check_interval: float = 5
+    db_replica_max_lag: float = 10
+    db_read_your_writes_ttl: int = 5
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
 
@@ -15,11 +29,49 @@ class DBSettings(BaseSettings):
     def db_url(self):
         return f"postgresql+asyncpg://{self.db_user}:{self.db_password.get_secret_value()}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    @property
+    def replica_urls(self) -> List[str]:
+        urls = []
+        for host in self.db_replica_hosts:
+            if ":" not in host:
+                host = f"{host}:{self.db_port}"
+            urls.append(
+                f"postgresql+asyncpg://{self.db_user}:{self.db_password.get_secret_value()}@{host}/{self.db_name}"
+            )
+        return urls
+
+    @property
+    def engine_options(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.db_pool_size,
+            "max_overflow": self.db_max_overflow,
+            "pool_timeout": self.db_pool_timeout,
+            "pool_recycle": self.db_pool_recycle,
+            "pool_pre_ping": self.db_pool_pre_ping,
+        }
+
+    @property
+    def asyncpg_connect_args(self) -> Dict[str, Any]:
+        server_settings = {"application_name": self.db_application_name}
+        if self.db_statement_timeout_ms:
+            server_settings["statement_timeout"] = str(self.db_statement_timeout_ms)
+        return {
+            # Both caches must be 0 behind pgbouncer in transaction mode
+            "statement_cache_size": self.db_statement_cache_size,
+            "prepared_statement_cache_size": self.db_statement_cache_size,
+            "server_settings": server_settings,
+        }
+
 
 class JWTSettings(BaseSettings):
     jwt_secret_key: SecretStr
     jwt_algorithm: str
     access_token_expire_min: int
+    refresh_token_expire_days: int = 30
+    jwt_backend: Literal["jose", "pyjwt"] = "jose"
+    jwt_cache_size: int = 10000
+    jwt_cache_max_ttl: int = 300
+    jwt_negative_cache_ttl: int = 30
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
 
@@ -31,6 +83,9 @@ class RedisSettings(BaseSettings):
     redis_db: int
     celery_db: int
     celery_back_db: int
+    redis_codec: Literal["json", "orjson", "msgpack"] = "orjson"
+    redis_compress_threshold: int = 1024
+    redis_compress_level: int = 1
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
 
@@ -66,16 +121,154 @@ class EmailSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
 
 
+class FeedSettings(BaseSettings):
+    feed_sample_size: int = 10
+    feed_max_attempts: int = 3
+    feed_batch_max_size: int = 20
+    feed_prefetch_bytes: int = 1024 * 1024
+    seen_filter_bits: int = 65536
+    seen_filter_hashes: int = 7
+    seen_filter_ttl_days: int = 30
+    feed_timeline_min_subscriptions: int = 200
+    feed_timeline_size: int = 500
+    feed_timeline_ttl: int = 60
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class CommentSettings(BaseSettings):
+    comment_score_decay_seconds: int = 45000
+    comment_score_confidence: float = 1.96
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class UserCacheSettings(BaseSettings):
+    user_cache_enabled: bool = True
+    user_cache_ttl: int = 300
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class PasswordSettings(BaseSettings):
+    pwd_hash_workers: int = 4
+    pwd_hash_queue_size: int = 64
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class RateLimitSettings(BaseSettings):
+    rate_limit_enabled: bool = True
+    rate_limit_login: str = "10/60"
+    rate_limit_register: str = "5/600"
+    rate_limit_change_password: str = "5/600"
+    rate_limit_add_comment: str = "30/60"
+    rate_limit_like_video: str = "120/60"
+    rate_limit_upload_video: str = "10/3600"
+    # Loopback and private ranges cover the nginx container on the docker networks
+    rate_limit_trusted_proxies: List[str] = [
+        "127.0.0.0/8",
+        "10.0.0.0/8",
+        "172.16.0.0/12",
+        "192.168.0.0/16",
+        "::1/128",
+        "fc00::/7",
+    ]
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class NearCacheSettings(BaseSettings):
+    near_cache_enabled: bool = True
+    near_cache_size: int = 10000
+    near_cache_ttl: float = 5
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class CacheSettings(BaseSettings):
+    cache_enabled: bool = True
+    cache_video_ttl: int = 60
+    cache_user_ttl: int = 120
+    cache_user_videos_ttl: int = 60
+    cache_comments_ttl: int = 30
+    cache_comments_page_size: int = 100
+    cache_early_refresh_beta: float = 1.0
+    cache_lock_ttl: int = 5
+    cache_lock_wait: float = 1.0
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class LogSettings(BaseSettings):
+    log_level: str = "INFO"
+    log_json: bool = True
+    log_console_color: bool = False
+    log_queue_size: int = 10000
+    log_body_sample_rate: float = 0.1
+    log_body_max_bytes: int = 4096
+    log_body_content_types: List[str] = ["application/json", "text/plain"]
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class MetricsSettings(BaseSettings):
+    metrics_enabled: bool = True
+    metrics_token: Optional[SecretStr] = None
+    metrics_stats_interval: float = 15
+    metrics_celery_queues: List[str] = ["celery"]
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class QueryTrackerSettings(BaseSettings):
+    query_tracker_enabled: bool = True
+    query_repeat_threshold: int = 10
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class ProfilerSettings(BaseSettings):
+    profiler_token: Optional[SecretStr] = None
+    profiler_interval_ms: float = 5
+    profiler_max_seconds: float = 60
+    slow_request_threshold_ms: float = 0
+    slow_request_capture_cooldown: float = 300
+    slow_request_capture_max_seconds: float = 10
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
+class SearchSettings(BaseSettings):
+    search_fallback_index_ttl: float = 60
+    search_text_config: str = "simple"
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
+
+
 class Settings(BaseSettings):
     db_settings: DBSettings = DBSettings()
     jwt_settings: JWTSettings = JWTSettings()
     redis_settings: RedisSettings = RedisSettings()
     s3_settings: S3Settings = S3Settings()
     email_settings: EmailSettings = EmailSettings()
+    feed_settings: FeedSettings = FeedSettings()
+    comment_settings: CommentSettings = CommentSettings()
+    user_cache_settings: UserCacheSettings = UserCacheSettings()
+    password_settings: PasswordSettings = PasswordSettings()
+    rate_limit_settings: RateLimitSettings = RateLimitSettings()
+    cache_settings: CacheSettings = CacheSettings()
+    near_cache_settings: NearCacheSettings = NearCacheSettings()
+    log_settings: LogSettings = LogSettings()
+    metrics_settings: MetricsSettings = MetricsSettings()
+    query_tracker_settings: QueryTrackerSettings = QueryTrackerSettings()
+    profiler_settings: ProfilerSettings = ProfilerSettings()
+    search_settings: SearchSettings = SearchSettings()
 
     default_avatar_url: str
     frontend_url: str
     backend_url: str
+    debug: bool = False
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
 
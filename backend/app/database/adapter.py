@@ -1,26 +1,102 @@
+import asyncio
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, List, Literal, Type, TypeVar
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Type,
+    TypeVar,
+)
 
 from app.core.logging import get_logger
+from app.core.metrics import TimedQueuePool, instrument_engine
+from app.core.query_tracker import track_queries
 from app.core.settings import settings
 from app.database.models import Base
-from sqlalchemy import func, update
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.database.routing import ReplicaRouter, RoutingSession
+from app.utils.trigram_index import TrigramIndex
+from app.utils.ttl_cache import TTLCache
+from sqlalchemy import Column, func, inspect, literal, text, true, tuple_, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.future import select
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.sql import and_, or_
-from thefuzz import fuzz, process
 
 logger = get_logger()
 
 T = TypeVar("T")
 
+ChangeListener = Callable[[List[Any], Optional[Set[str]]], Awaitable[None]]
+Backfill = Callable[[], Awaitable[None]]
+
 
 class AsyncDatabaseAdapter:
-    def __init__(self, database_url: str = settings.db_settings.db_url) -> None:
-        self.engine = create_async_engine(database_url, echo=False, future=True)
+    def __init__(
+        self,
+        database_url: str = settings.db_settings.db_url,
+        replica_urls: List[str] = settings.db_settings.replica_urls,
+    ) -> None:
+        self.engine = self._create_engine(database_url)
+        self.router = (
+            ReplicaRouter([self._create_engine(url) for url in replica_urls])
+            if replica_urls
+            else None
+        )
         self.SessionLocal = async_sessionmaker(
-            bind=self.engine, class_=AsyncSession, expire_on_commit=False
+            bind=self.engine,
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            router=self.router,
+            expire_on_commit=False,
         )
+        self.listeners: Dict[type, List[ChangeListener]] = {}
+        self.backfills: Dict[str, Backfill] = {}
+        self.trigram_search: Optional[bool] = None
+        self.search_indexes = TTLCache(32, settings.search_settings.search_fallback_index_ttl)
+
+    @staticmethod
+    def _create_engine(url: str) -> AsyncEngine:
+        options = settings.db_settings.engine_options
+        if make_url(url).drivername == "postgresql+asyncpg":
+            options["connect_args"] = settings.db_settings.asyncpg_connect_args
+        engine = create_async_engine(
+            url,
+            echo=False,
+            future=True,
+            poolclass=TimedQueuePool,
+            **options,
+        )
+        instrument_engine(engine)
+        track_queries(engine)
+        return engine
+
+    def add_backfill(self, column: Any, backfill: Backfill) -> None:
+        # Runs once, right after initialize_tables adds the column to an existing table
+        self.backfills[f"{column.table.name}.{column.name}"] = backfill
+
+    def add_listener(self, model: type, listener: ChangeListener) -> None:
+        self.listeners.setdefault(model, []).append(listener)
+
+    async def _notify(self, model: type, ids: List[Any], fields: Optional[Set[str]]) -> None:
+        # fields is None for deletes
+        for listener in self.listeners.get(model, ()):
+            try:
+                await listener(ids, fields)
+            except Exception as e:
+                logger.exception(f"Change listener error for {model.__name__}: {e}")
 
     @asynccontextmanager
     async def get_or_create_session(
@@ -32,11 +108,61 @@ class AsyncDatabaseAdapter:
             async with self.SessionLocal() as new_session:
                 yield new_session
 
+    @asynccontextmanager
+    async def primary_session(self) -> AsyncGenerator[AsyncSession, None]:
+        # Shared caches outlive the request, so they are never filled from a lagging replica
+        async with self.SessionLocal() as session:
+            session.info["primary"] = True
+            yield session
+
     async def initialize_tables(self) -> None:
         logger.info(settings.db_settings.db_url)
         logger.info("Tables are created or exists")
         async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            if conn.dialect.name == "postgresql":
+                available = await conn.scalar(
+                    text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+                )
+                if available:
+                    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                else:
+                    logger.warning("pg_trgm is not available, similarity search runs in memory")
+            added = await conn.run_sync(self._create_all)
+        for column in added:
+            backfill = self.backfills.get(f"{column.table.name}.{column.name}")
+            if backfill is not None:
+                logger.info(f"Backfilling {column.table.name}.{column.name}")
+                await backfill()
+
+    @staticmethod
+    def _create_all(conn) -> List[Column]:
+        Base.metadata.create_all(conn)
+        # create_all skips existing tables, so columns and indexes added later are created here
+        inspector = inspect(conn)
+        added = []
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            table_name = conn.dialect.identifier_preparer.format_table(table)
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not (column.nullable or column.computed or column.server_default is not None):
+                    logger.error(
+                        f"Column {table.name}.{column.name} is NOT NULL without a server default "
+                        "and has to be added manually"
+                    )
+                    continue
+                column_ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_ddl}"))
+                existing.add(column.name)
+                added.append(column)
+            for index in table.indexes:
+                missing = [column.name for column in index.columns if column.name not in existing]
+                if missing:
+                    logger.error(f"Skipping index {index.name}, missing columns: {missing}")
+                    continue
+                index.create(conn, checkfirst=True)
+        return added
 
     async def get_all(self, model, session: AsyncSession | None = None) -> List[Any]:
         async with self.get_or_create_session(session) as s:
@@ -115,6 +241,7 @@ class AsyncDatabaseAdapter:
             stmt = update(model).where(model.id == record_id).values(**updates)
             await s.execute(stmt)
             await s.commit()
+        await self._notify(model, [record_id], set(updates))
 
     async def update_by_value(
         self, model, filters: dict, updates: dict, session: AsyncSession | None = None
@@ -122,8 +249,14 @@ class AsyncDatabaseAdapter:
         async with self.get_or_create_session(session) as s:
             conditions = [getattr(model, key) == value for key, value in filters.items()]
             stmt = update(model).where(and_(*conditions)).values(**updates)
-            await s.execute(stmt)
+            if model not in self.listeners:
+                await s.execute(stmt)
+                await s.commit()
+                return
+            result = await s.execute(stmt.returning(model.id))
+            ids = result.scalars().all()
             await s.commit()
+        await self._notify(model, ids, set(updates))
 
     async def delete(self, model, id: int, session: AsyncSession | None = None) -> Any:
         async with self.get_or_create_session(session) as s:
@@ -132,7 +265,9 @@ class AsyncDatabaseAdapter:
             if record:
                 await s.delete(record)
                 await s.commit()
-            return record
+        if record:
+            await self._notify(model, [id], None)
+        return record
 
     async def delete_by_value(
         self, model, parameter: str, parameter_value: Any, session: AsyncSession | None = None
@@ -145,7 +280,9 @@ class AsyncDatabaseAdapter:
             for record in records:
                 await s.delete(record)
             await s.commit()
-            return records
+        if records and model in self.listeners:
+            await self._notify(model, [record.id for record in records], None)
+        return records
 
     async def get_comment_replies(self, comment_id: Any, session: AsyncSession | None = None):
         from app.database.models import Comment
@@ -155,6 +292,177 @@ class AsyncDatabaseAdapter:
             result = await s.execute(stmt)
             return result.scalars().all()
 
+    async def get_root_comments(
+        self,
+        video_id: Any,
+        user_id: Any,
+        sort: Literal["new", "top"] = "new",
+        limit: int | None = None,
+        after_id: Any = None,
+        after_score: float | None = None,
+        session: AsyncSession | None = None,
+    ) -> List[Any]:
+        from app.database.models import Comment, CommentLike
+
+        async with self.get_or_create_session(session) as s:
+            if user_id is None:
+                stmt = select(Comment, literal(None).label("like"))
+            else:
+                stmt = select(Comment, CommentLike.like).outerjoin(
+                    CommentLike,
+                    and_(CommentLike.comment_id == Comment.id, CommentLike.user_id == user_id),
+                )
+            stmt = stmt.where(Comment.video_id == video_id, Comment.parent_id.is_(None))
+            if sort == "top":
+                if after_id is not None and after_score is not None:
+                    stmt = stmt.where(tuple_(Comment.score, Comment.id) < (after_score, after_id))
+                stmt = stmt.order_by(Comment.score.desc(), Comment.id.desc())
+            else:
+                if after_id is not None:
+                    stmt = stmt.where(Comment.id < after_id)
+                stmt = stmt.order_by(Comment.id.desc())
+            if limit:
+                stmt = stmt.limit(limit)
+            result = await s.execute(stmt)
+            return result.all()
+
+    async def get_comment_tree(
+        self,
+        comment_id: Any,
+        user_id: Any,
+        max_depth: int,
+        max_children: int,
+        session: AsyncSession | None = None,
+    ) -> List[Any]:
+        from app.database.models import Comment, CommentLike
+
+        async with self.get_or_create_session(session) as s:
+            tree = (
+                select(Comment.id, literal(0).label("depth"))
+                .where(Comment.id == comment_id)
+                .cte("comment_tree", recursive=True)
+            )
+            children = (
+                select(Comment.id)
+                .where(Comment.parent_id == tree.c.id)
+                .order_by(Comment.created_at)
+                .limit(max_children)
+                .lateral("children")
+            )
+            tree = tree.union_all(
+                select(children.c.id, tree.c.depth + 1)
+                .select_from(tree.join(children, true()))
+                .where(tree.c.depth < max_depth)
+            )
+            stmt = (
+                select(Comment, CommentLike.like)
+                .join(tree, tree.c.id == Comment.id)
+                .outerjoin(
+                    CommentLike,
+                    and_(CommentLike.comment_id == Comment.id, CommentLike.user_id == user_id),
+                )
+                .order_by(tree.c.depth, Comment.created_at)
+            )
+            result = await s.execute(stmt)
+            return result.all()
+
+    async def get_videos_with_author(
+        self, video_ids: List[Any], user_id: Any, session: AsyncSession | None = None
+    ) -> List[Any]:
+        from app.database.models import Like, User, Video
+
+        if not video_ids:
+            return []
+        async with self.get_or_create_session(session) as s:
+            if user_id is None:
+                stmt = select(Video, User.name, User.username, literal(None).label("like"))
+            else:
+                stmt = select(Video, User.name, User.username, Like.like).outerjoin(
+                    Like, and_(Like.video_id == Video.id, Like.user_id == user_id)
+                )
+            stmt = stmt.join(User, User.id == Video.author_id).where(Video.id.in_(video_ids))
+            result = await s.execute(stmt)
+            return result.all()
+
+    async def get_comment_likes(
+        self, user_id: Any, comment_ids: List[Any], session: AsyncSession | None = None
+    ) -> Dict[Any, bool]:
+        from app.database.models import CommentLike
+
+        if not comment_ids:
+            return {}
+        async with self.get_or_create_session(session) as s:
+            stmt = select(CommentLike.comment_id, CommentLike.like).where(
+                CommentLike.user_id == user_id, CommentLike.comment_id.in_(comment_ids)
+            )
+            result = await s.execute(stmt)
+            return dict(result.all())
+
+    async def get_subscription_feed(
+        self,
+        user_id: Any,
+        limit: int,
+        before: datetime | None = None,
+        session: AsyncSession | None = None,
+    ) -> List[Any]:
+        from app.database.models import Like, Subscription, User, Video
+
+        async with self.get_or_create_session(session) as s:
+            stmt = (
+                select(Video, User.name, User.username, Like.like)
+                .join(Subscription, Subscription.subscribed_to_id == Video.author_id)
+                .join(User, User.id == Video.author_id)
+                .outerjoin(Like, and_(Like.video_id == Video.id, Like.user_id == user_id))
+                .where(Subscription.subscriber_id == user_id)
+            )
+            if before:
+                stmt = stmt.where(Video.created_at < before)
+            stmt = stmt.order_by(Video.created_at.desc(), Video.id.desc()).limit(limit)
+            result = await s.execute(stmt)
+            return result.all()
+
+    async def get_subscription_feed_ids(
+        self, user_id: Any, limit: int, session: AsyncSession | None = None
+    ) -> List[Any]:
+        from app.database.models import Subscription, Video
+
+        async with self.get_or_create_session(session) as s:
+            stmt = (
+                select(Video.id, Video.created_at)
+                .join(Subscription, Subscription.subscribed_to_id == Video.author_id)
+                .where(Subscription.subscriber_id == user_id)
+                .order_by(Video.created_at.desc(), Video.id.desc())
+                .limit(limit)
+            )
+            result = await s.execute(stmt)
+            return result.all()
+
+    async def search_videos(
+        self,
+        query: str,
+        user_id: Any,
+        limit: int,
+        after_rank: float | None = None,
+        after_id: Any = None,
+        session: AsyncSession | None = None,
+    ) -> List[Any]:
+        from app.database.models import Like, User, Video
+
+        async with self.get_or_create_session(session) as s:
+            tsquery = func.websearch_to_tsquery(settings.search_settings.search_text_config, query)
+            rank = func.ts_rank_cd(Video.search_vector, tsquery)
+            stmt = (
+                select(Video, User.name, User.username, Like.like, rank)
+                .join(User, User.id == Video.author_id)
+                .outerjoin(Like, and_(Like.video_id == Video.id, Like.user_id == user_id))
+                .where(Video.search_vector.op("@@")(tsquery))
+            )
+            if after_rank is not None and after_id is not None:
+                stmt = stmt.where(tuple_(rank, Video.id) < (after_rank, after_id))
+            stmt = stmt.order_by(rank.desc(), Video.id.desc()).limit(limit)
+            result = await s.execute(stmt)
+            return result.all()
+
     async def get_all_with_join(
         self,
         parent_model,
@@ -284,35 +592,55 @@ class AsyncDatabaseAdapter:
         column_name: str,
         search_value: str,
         limit: int = 5,
-        similarity_threshold: int = 85,
+        similarity_threshold: int = 30,
         session: AsyncSession | None = None,
     ) -> list:
-        all_records = await self.get_all(model, session=session)
-        values = []
-        records_map = {}
-        for record in all_records:
-            value = getattr(record, column_name)
-            if value not in records_map:
-                records_map[value] = []
-            records_map[value].append(record)
-            values.append(value)
-        results = process.extractBests(
-            search_value,
-            list(set(values)),
-            limit=limit * 5,
-            score_cutoff=similarity_threshold,
-            scorer=fuzz.token_sort_ratio,
-        )
+        column = getattr(model, column_name)
+        threshold = similarity_threshold / 100
+        async with self.get_or_create_session(session) as s:
+            if self.trigram_search is None:
+                self.trigram_search = self.engine.dialect.name == "postgresql" and bool(
+                    await s.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+                )
+            if self.trigram_search:
+                # % uses the trigram GIN index, the threshold is per transaction
+                await s.execute(
+                    select(func.set_config("pg_trgm.similarity_threshold", str(threshold), True))
+                )
+                similarity = func.similarity(column, search_value)
+                result = await s.execute(
+                    select(model, similarity)
+                    .where(column.op("%")(search_value))
+                    .order_by(similarity.desc())
+                    .limit(limit)
+                )
+                matches = result.all()
+            else:
+                index = await self._trigram_index(model, column_name, s)
+                scores = dict(index.search(search_value, threshold, limit))
+                result = await s.execute(select(model).where(column.in_(scores)))
+                matches = [
+                    (record, scores[getattr(record, column_name)]) for record in result.scalars()
+                ]
+                matches.sort(key=lambda match: match[1], reverse=True)
+
         output = []
-        for value, score in results:
-            for record in records_map[value]:
-                record_dict = {}
-                for column in record.__table__.columns:
-                    record_dict[column.name] = getattr(record, column.name)
-                record_dict["similarity"] = score
-                output.append(record_dict)
-        output.sort(key=lambda x: x["similarity"], reverse=True)
-        return output[:limit]
+        for record, score in matches[:limit]:
+            record_dict = {}
+            for table_column in record.__table__.columns:
+                record_dict[table_column.name] = getattr(record, table_column.name)
+            record_dict["similarity"] = round(score * 100)
+            output.append(record_dict)
+        return output
+
+    async def _trigram_index(self, model, column_name: str, session: AsyncSession) -> TrigramIndex:
+        key = (model, column_name)
+        index = self.search_indexes.get(key)
+        if index is None:
+            result = await session.execute(select(getattr(model, column_name)))
+            index = await asyncio.to_thread(TrigramIndex, result.scalars().all())
+            self.search_indexes.set(key, index)
+        return index
 
 
 adapter = AsyncDatabaseAdapter()
@@ -7,13 +7,18 @@ from app.database.mixins.id_mixins import IDMixin, RandomIDMixin
 from app.database.mixins.timestamp_mixins import CreatedAtMixin, TimestampsMixin
 from sqlalchemy import (
     Boolean,
+    Computed,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     Uuid,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import (
     Mapped,
     declarative_base,
@@ -34,6 +39,24 @@ class Base:
 Base = declarative_base(cls=Base)
 
 
+def has_pg_trgm(ddl, target, bind, **kw) -> bool:
+    if bind is None or bind.dialect.name != "postgresql":
+        return False
+    return bool(
+        bind.exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'").scalar()
+    )
+
+
+class PostgresComputed(Computed):
+    pass
+
+
+@compiles(PostgresComputed, "sqlite")
+def _compile_sqlite_computed(element, compiler, **kw) -> str:
+    # The expression uses Postgres-only functions, SQLite keeps a plain nullable column
+    return ""
+
+
 class CommentLike(RandomIDMixin, CreatedAtMixin, Base):
     user_id: Mapped[UUID] = mapped_column(
         Uuid,
@@ -74,6 +97,7 @@ class Comment(IDMixin, CreatedAtMixin, Base):
     likes: Mapped[int] = mapped_column(default=0, nullable=False)
     dislikes: Mapped[int] = mapped_column(default=0, nullable=False)
     replies_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    score: Mapped[float] = mapped_column(Float, default=0, server_default="0", nullable=False)
 
     user = relationship("User", back_populates="comments")
     video = relationship("Video", back_populates="comment_list")
@@ -85,6 +109,10 @@ class Comment(IDMixin, CreatedAtMixin, Base):
         backref="replies",
     )
 
+    __table_args__ = (
+        Index("ix_comments_video_id_parent_id_score", "video_id", "parent_id", "score", "id"),
+    )
+
 
 class Subscription(CreatedAtMixin, Base):
     subscriber_id: Mapped[UUID] = mapped_column(
@@ -163,6 +191,21 @@ class User(IDMixin, TimestampsMixin, Base):
     comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan")
     comment_likes = relationship("CommentLike", backref="user", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ).ddl_if(callable_=has_pg_trgm),
+        Index(
+            "ix_users_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(callable_=has_pg_trgm),
+    )
+
 
 class Video(TimestampsMixin, Base):
     id: Mapped[UUID] = mapped_column(Uuid, primary_key=True)
@@ -177,7 +220,24 @@ class Video(TimestampsMixin, Base):
     dislikes: Mapped[int] = mapped_column(default=0)
     comments: Mapped[int] = mapped_column(default=0)
     description: Mapped[str] = mapped_column(Text, nullable=True, default="")
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        PostgresComputed(
+            f"to_tsvector('{settings.search_settings.search_text_config}', "
+            "coalesce(description, ''))",
+            persisted=True,
+        ),
+        nullable=True,
+        deferred=True,
+    )
 
     author = relationship("User", back_populates="videos")
     comment_list = relationship("Comment", back_populates="video", cascade="all, delete-orphan")
     likes_list = relationship("Like", backref="video", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_videos_author_id_created_at", "author_id", "created_at"),
+        Index("ix_videos_search_vector", "search_vector", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+    )
@@ -0,0 +1,153 @@
+import asyncio
+from contextvars import ContextVar
+from itertools import count
+from typing import Any, Dict, List, Optional
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.utils.redis_adapter import redis_adapter
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+logger = get_logger()
+
+# NULL means the WAL receiver is not streaming: the replica has stopped advancing even if it has
+# replayed everything it received. Without pg_read_all_stats the status column is hidden and
+# only the receiver row itself is visible. The replay timestamp only moves when the primary
+# commits, so a replica that has replayed all received WAL counts as caught up.
+LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver "
+    "WHERE COALESCE(status, 'streaming') = 'streaming') THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class RequestDBState:
+    def __init__(self, user_id: Any, primary: bool = False):
+        self.user_id = user_id
+        self.primary = primary
+        self.wrote = False
+
+
+request_db_state: ContextVar[Optional[RequestDBState]] = ContextVar(
+    "request_db_state", default=None
+)
+
+
+class ReplicaRouter:
+    def __init__(self, engines: List[AsyncEngine]):
+        self.engines = engines
+        # Replicas take reads only after their first successful lag check
+        self.healthy: Dict[Engine, bool] = {engine.sync_engine: False for engine in engines}
+        self.counter = count()
+        self.checker: Optional[asyncio.Task] = None
+        for engine in engines:
+            event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        if context.is_disconnect and context.engine in self.healthy:
+            self.healthy[context.engine] = False
+            logger.warning(f"Replica {context.engine.url.host} marked unhealthy: disconnect")
+
+    def choose(self) -> Optional[Engine]:
+        candidates = [engine for engine, ok in self.healthy.items() if ok]
+        if not candidates:
+            return None
+        return candidates[next(self.counter) % len(candidates)]
+
+    async def _check(self, engine: AsyncEngine) -> bool:
+        try:
+            async with engine.connect() as conn:
+                lag = await asyncio.wait_for(conn.scalar(LAG_QUERY), timeout=2)
+            if lag is None:
+                logger.warning(f"Replica {engine.url.host} WAL receiver is not streaming")
+                return False
+            if lag > settings.db_settings.db_replica_max_lag:
+                logger.warning(f"Replica {engine.url.host} lagging {lag:.1f}s")
+                return False
+            return True
+        except Exception as e:
+            logger.warning(f"Replica {engine.url.host} health check failed: {e}")
+            return False
+
+    async def _check_loop(self) -> None:
+        while True:
+            for engine in self.engines:
+                self.healthy[engine.sync_engine] = await self._check(engine)
+            await asyncio.sleep(settings.db_settings.db_replica_check_interval)
+
+    def start(self) -> None:
+        if self.engines and self.checker is None:
+            self.checker = asyncio.create_task(self._check_loop())
+
+    async def stop(self) -> None:
+        if self.checker is not None:
+            self.checker.cancel()
+            try:
+                await self.checker
+            except asyncio.CancelledError:
+                pass
+            self.checker = None
+        for engine in self.engines:
+            await engine.dispose()
+
+
+class RoutingSession(Session):
+    def __init__(self, *args, router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if clause is None and not self._flushing:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+
+        read = (
+            not self._flushing
+            and clause.is_select
+            and getattr(clause, "_for_update_arg", None) is None
+        )
+        state = request_db_state.get()
+        if not read:
+            # The rest of this unit of work must see its own writes
+            self.info["primary"] = True
+            if state is not None:
+                state.wrote = True
+        if (
+            not read
+            or self.router is None
+            or self.info.get("primary")
+            or (state is not None and state.primary)
+        ):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.info["replica"] = self.router.choose()
+        if replica is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return replica
+
+
+def _read_your_writes_key(user_id: Any) -> str:
+    return f"ryw:{user_id}"
+
+
+async def begin_request(user_id: Any, router: Optional[ReplicaRouter]) -> None:
+    ttl = settings.db_settings.db_read_your_writes_ttl
+    primary = False
+    if router is not None and ttl > 0:
+        primary = await redis_adapter.exists(_read_your_writes_key(user_id))
+    request_db_state.set(RequestDBState(user_id, primary))
+
+
+async def end_request(router: Optional[ReplicaRouter]) -> None:
+    state = request_db_state.get()
+    ttl = settings.db_settings.db_read_your_writes_ttl
+    request_db_state.set(None)
+    if router is not None and state is not None and state.wrote and ttl > 0:
+        await redis_adapter.set(_read_your_writes_key(state.user_id), 1, expire=ttl)
@@ -1,9 +1,19 @@
 from typing import AsyncGenerator
 
 from app.database.adapter import adapter
+from app.database.routing import end_request
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+
+async def get_async_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     async with adapter.SessionLocal() as session:
-        yield session
+        if request.method not in SAFE_METHODS:
+            # Mutating routes read the rows they are about to change, a lagging replica loses updates
+            session.info["primary"] = True
+        try:
+            yield session
+        finally:
+            await end_request(adapter.router)
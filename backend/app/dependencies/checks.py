@@ -4,9 +4,12 @@ from uuid import UUID
 from app.core.logging import get_logger
 from app.database.adapter import adapter
 from app.database.models import User
+from app.database.routing import begin_request
 from app.database.session import get_async_session
 from app.utils.cookies import get_tokens_cookies
+from app.utils.session_store import session_store
 from app.utils.token_manager import TokenManager
+from app.utils.user_cache import user_cache
 from fastapi import Depends
 from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,7 +22,9 @@ async def check_user_token(
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> User:
     data = TokenManager.decode_token(tokens["access"])
-    user = await adapter.get_by_id(User, UUID(data["sub"]), session=session)
+    await session_store.check(data["sub"], data)
+    await begin_request(data["sub"], adapter.router)
+    user = await user_cache.get(UUID(data["sub"]), session=session)
     if user:
         return user
 
@@ -32,7 +37,8 @@ async def check_refresh(
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> User:
     data = TokenManager.decode_token(tokens["refresh"], access=False)
-    user = await adapter.get_by_id(User, UUID(data["sub"]), session=session)
+    await session_store.check(data["sub"], data)
+    user = await user_cache.get(UUID(data["sub"]), session=session)
     if user:
         return user
 
@@ -0,0 +1,96 @@
+import math
+from ipaddress import ip_address, ip_network
+from time import time
+from typing import Literal
+from uuid import uuid4
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.utils.redis_adapter import redis_adapter
+from app.utils.token_manager import TokenManager
+from fastapi import Request
+from fastapi.exceptions import HTTPException
+
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+if redis.call('ZCARD', key) < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return 0
+end
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return math.max(tonumber(oldest[2]) + window - now, 1)
+"""
+
+logger = get_logger()
+
+redis_adapter.register_script("sliding_window", SLIDING_WINDOW_SCRIPT)
+
+TRUSTED_PROXIES = [
+    ip_network(proxy, strict=False)
+    for proxy in settings.rate_limit_settings.rate_limit_trusted_proxies
+]
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+class RateLimiter:
+    warned_untrusted_proxy = False
+
+    def __init__(self, name: str, rate: str, by: Literal["ip", "user"] = "ip"):
+        limit, window = rate.split("/")
+        self.name = name
+        self.limit = int(limit)
+        self.window_ms = int(window) * 1000
+        self.by = by
+
+    @staticmethod
+    def _client_ip(request: Request) -> str:
+        host = request.client.host if request.client else "unknown"
+        # X-Real-IP is client controlled unless it was set by our own proxy
+        if _is_trusted_proxy(host):
+            return request.headers.get("x-real-ip") or host
+        if "x-real-ip" in request.headers and not RateLimiter.warned_untrusted_proxy:
+            RateLimiter.warned_untrusted_proxy = True
+            logger.warning(
+                f"Ignoring X-Real-IP from untrusted peer {host}, all clients behind it share "
+                "one rate limit bucket unless RATE_LIMIT_TRUSTED_PROXIES includes it"
+            )
+        return host
+
+    def _identity(self, request: Request) -> str:
+        if self.by == "user":
+            token = request.cookies.get("access_token")
+            if token:
+                try:
+                    return f"user:{TokenManager.decode_token(token)['sub']}"
+                except HTTPException:
+                    pass
+        return f"ip:{self._client_ip(request)}"
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.rate_limit_settings.rate_limit_enabled:
+            return
+
+        key = f"rate_limit:{self.name}:{self._identity(request)}"
+        retry_after_ms = await redis_adapter.eval_script(
+            "sliding_window",
+            keys=[key],
+            args=[int(time() * 1000), self.window_ms, self.limit, uuid4().hex],
+        )
+        if retry_after_ms:
+            raise HTTPException(
+                429,
+                "Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after_ms / 1000))},
+            )
@@ -1,11 +1,21 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
+from app.api.auth.utils import pwd_stats
+from app.core import metrics
 from app.core.log_middleware import LoggingMiddleware
-from app.core.logging import setup_logging
+from app.core.logging import dropped_log_records, setup_logging
+from app.core.profiler import install_profiler
+from app.core.query_tracker import QueryTrackerMiddleware
 from app.core.routers_loader import include_all_routers
 from app.core.settings import settings
 from app.database.adapter import adapter
+from app.utils.near_cache import near_cache
+from app.utils.response_cache import response_cache
 from app.utils.s3_adapter import S3HttpxSigV4Adapter
+from app.utils.token_manager import TokenManager
+from app.utils.user_cache import user_cache
+from app.utils.video_sampler import video_sampler
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
@@ -14,6 +24,11 @@ from fastapi.responses import RedirectResponse
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await adapter.initialize_tables()
+    await video_sampler.warm_up()
+    near_cache.start()
+    if adapter.router:
+        adapter.router.start()
+    stats_task = asyncio.create_task(metrics.refresh_stats())
 
     s3_b1 = S3HttpxSigV4Adapter(settings.s3_settings.bucket1)
     s3_b2 = S3HttpxSigV4Adapter(settings.s3_settings.bucket2)
@@ -22,6 +37,13 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    stats_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await stats_task
+    metrics.mark_process_dead()
+    await near_cache.stop()
+    if adapter.router:
+        await adapter.router.stop()
     await s3_b1.client.aclose()
     await s3_b2.client.aclose()
 
@@ -39,6 +61,21 @@ def create_app() -> FastAPI:
 
     include_all_routers(app)
     app.add_middleware(LoggingMiddleware)
+    if settings.query_tracker_settings.query_tracker_enabled:
+        app.add_middleware(QueryTrackerMiddleware)
+
+    if settings.metrics_settings.metrics_enabled:
+        app.add_middleware(metrics.MetricsMiddleware)
+        app.add_route("/metrics", metrics.metrics_endpoint, include_in_schema=False)
+        metrics.register_stats("user_cache", user_cache.stats)
+        metrics.register_stats("response_cache", response_cache.stats)
+        metrics.register_stats("near_cache", near_cache.stats)
+        metrics.register_stats("jwt_verified_cache", TokenManager.verified_cache.stats)
+        metrics.register_stats("jwt_rejected_cache", TokenManager.rejected_cache.stats)
+        metrics.register_stats("pwd_hash", lambda: pwd_stats)
+        metrics.register_stats("logging", lambda: {"dropped": dropped_log_records()})
+
+    install_profiler(app)
 
     app.add_middleware(
         CORSMiddleware,
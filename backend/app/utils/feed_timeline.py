@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from uuid import UUID
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.database.adapter import adapter
+from app.utils.redis_adapter import AsyncRedisAdapter, redis_adapter
+
+logger = get_logger()
+
+
+class FeedTimeline:
+    def __init__(
+        self,
+        redis: AsyncRedisAdapter = redis_adapter,
+        size: int = settings.feed_settings.feed_timeline_size,
+        ttl: int = settings.feed_settings.feed_timeline_ttl,
+    ):
+        self.redis = redis
+        self.size = size
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: Any) -> str:
+        return f"timeline:{user_id}"
+
+    async def _build(self, user_id: Any) -> None:
+        rows = await adapter.get_subscription_feed_ids(user_id, self.size)
+        key = self._key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if rows:
+                pipe.zadd(key, {str(video_id): ts.timestamp() for video_id, ts in rows})
+            else:
+                pipe.zadd(key, {"": 0})
+            pipe.expire(key, self.ttl)
+
+    async def get_page(
+        self, user_id: Any, limit: int, before: Optional[datetime] = None
+    ) -> Optional[List[UUID]]:
+        key = self._key(user_id)
+        max_score = f"({before.timestamp()}" if before else "+inf"
+        try:
+            if not await self.redis.exists(key):
+                await self._build(user_id)
+            video_ids = await self.redis.zrevrangebyscore(key, max_score, "(0", count=limit)
+            if video_ids is None:
+                return None
+            if len(video_ids) < limit and await self.redis.zcard(key) >= self.size:
+                return None
+            return [UUID(video_id) for video_id in video_ids]
+        except Exception as e:
+            logger.exception(f"Feed timeline error: {e}")
+            return None
+
+    async def invalidate(self, user_id: Any) -> None:
+        await self.redis.delete(self._key(user_id))
+
+
+feed_timeline = FeedTimeline()
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.utils.redis_adapter import AsyncRedisAdapter, redis_adapter
+from app.utils.ttl_cache import TTLCache
+
+logger = get_logger()
+
+
+class NearCache:
+    CHANNEL = "near_cache:invalidate"
+    RECONNECT_DELAY = 1
+
+    def __init__(
+        self,
+        redis: AsyncRedisAdapter = redis_adapter,
+        maxsize: int = settings.near_cache_settings.near_cache_size,
+        ttl: float = settings.near_cache_settings.near_cache_ttl,
+    ):
+        self.redis = redis
+        self.enabled = settings.near_cache_settings.near_cache_enabled
+        self.local = TTLCache(maxsize, ttl)
+        self.listener: Optional[asyncio.Task] = None
+        self.received = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        return self.local.get(key)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        if ttl is not None:
+            ttl = min(ttl, self.local.ttl)
+        self.local.set(key, value, ttl=ttl)
+
+    async def invalidate(self, *keys: str) -> None:
+        if not keys:
+            return
+        for key in keys:
+            self.local.pop(key)
+        if self.enabled:
+            await self.redis.publish(self.CHANNEL, "\n".join(keys))
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    # Messages may have been missed while disconnected
+                    self.local.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        self.received += 1
+                        for key in message["data"].split("\n"):
+                            self.local.pop(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Near cache listener error: {e}")
+                self.local.clear()
+                await asyncio.sleep(self.RECONNECT_DELAY)
+
+    def start(self) -> None:
+        if self.enabled and self.listener is None:
+            self.listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self.listener is None:
+            return
+        self.listener.cancel()
+        try:
+            await self.listener
+        except asyncio.CancelledError:
+            pass
+        self.listener = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self.local),
+            "hits": self.local.hits,
+            "misses": self.local.misses,
+            "invalidations_received": self.received,
+        }
+
+
+near_cache = NearCache()
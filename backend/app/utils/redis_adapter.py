@@ -1,24 +1,66 @@
-import json
-from typing import Any, Optional
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional
 
 import redis.asyncio as redis
 from app.core.logging import get_logger
+from app.core.metrics import REDIS_COMMAND_DURATION, REDIS_COMMAND_ERRORS
 from app.core.settings import settings
+from app.utils.redis_codecs import ValueSerializer, get_codec
 
 logger = get_logger()
 
 
+class InstrumentedPipeline(redis.client.Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        start = perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        except Exception:
+            REDIS_COMMAND_ERRORS.labels("PIPELINE").inc()
+            raise
+        finally:
+            REDIS_COMMAND_DURATION.labels("PIPELINE").observe(perf_counter() - start)
+
+
+class InstrumentedRedis(redis.Redis):
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        command = str(args[0]).split(" ", 1)[0].upper()
+        start = perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            REDIS_COMMAND_ERRORS.labels(command).inc()
+            raise
+        finally:
+            REDIS_COMMAND_DURATION.labels(command).observe(perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> Any:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
 class AsyncRedisAdapter:
     def __init__(self, decode_responses: bool = True):
-        self.redis = redis.Redis.from_url(
+        self.redis = InstrumentedRedis.from_url(
             settings.redis_settings.redis_url, decode_responses=decode_responses
         )
+        # Values go through a binary client so the serializer can tag and compress them
+        self.binary = InstrumentedRedis.from_url(settings.redis_settings.redis_url)
+        self.serializer = ValueSerializer(
+            get_codec(settings.redis_settings.redis_codec),
+            compress_threshold=settings.redis_settings.redis_compress_threshold,
+            compress_level=settings.redis_settings.redis_compress_level,
+        )
+        self.scripts: Dict[str, Any] = {}
 
-    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+    async def set(
+        self, key: str, value: Any, expire: Optional[int] = None, codec: Optional[str] = None
+    ) -> bool:
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            await self.redis.set(key, value, ex=expire)
+            data = self.serializer.dumps(value, get_codec(codec) if codec else None)
+            await self.binary.set(key, data, ex=expire)
             return True
         except Exception as e:
             logger.exception(f"Redis SET error: {e}")
@@ -26,21 +68,17 @@ class AsyncRedisAdapter:
 
     async def get(self, key: str) -> Optional[Any]:
         try:
-            value = await self.redis.get(key)
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+            return self.serializer.loads(await self.binary.get(key))
         except Exception as e:
             logger.exception(f"Redis GET error: {e}")
             return None
 
-    async def delete(self, key: str) -> bool:
+    async def delete(self, key: str) -> Optional[bool]:
         try:
             return await self.redis.delete(key) > 0
         except Exception as e:
             logger.exception(f"Redis DELETE error: {e}")
-            return False
+            return None
 
     async def exists(self, key: str) -> bool:
         try:
@@ -56,8 +94,236 @@ class AsyncRedisAdapter:
             logger.exception(f"Redis EXPIRE error: {e}")
             return False
 
+    async def set_nx(self, key: str, value: str, expire: Optional[int] = None) -> Optional[bool]:
+        try:
+            return bool(await self.redis.set(key, value, ex=expire, nx=True))
+        except Exception as e:
+            logger.exception(f"Redis SET NX error: {e}")
+            return None
+
+    async def get_counter(self, key: str) -> Optional[int]:
+        try:
+            return int(await self.redis.get(key) or 0)
+        except Exception as e:
+            logger.exception(f"Redis GET counter error: {e}")
+            return None
+
+    async def incr(self, key: str, amount: int = 1) -> Optional[int]:
+        try:
+            return await self.redis.incr(key, amount)
+        except Exception as e:
+            logger.exception(f"Redis INCR error: {e}")
+            return None
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        try:
+            values = await self.binary.mget(keys)
+        except Exception as e:
+            logger.exception(f"Redis MGET error: {e}")
+            return [None] * len(keys)
+        result = []
+        for value in values:
+            try:
+                result.append(self.serializer.loads(value))
+            except Exception as e:
+                logger.exception(f"Redis MGET decode error: {e}")
+                result.append(None)
+        return result
+
+    async def mset(
+        self,
+        mapping: Mapping[str, Any],
+        expire: Optional[int] = None,
+        codec: Optional[str] = None,
+    ) -> bool:
+        try:
+            value_codec = get_codec(codec) if codec else None
+            async with self.binary.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, self.serializer.dumps(value, value_codec), ex=expire)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.exception(f"Redis MSET error: {e}")
+            return False
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[Any]:
+        async with self.redis.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            if pipe.command_stack:
+                await pipe.execute()
+
+    async def bitfield_get(self, key: str, offsets: List[int]) -> Optional[List[int]]:
+        try:
+            bitfield = self.redis.bitfield(key)
+            for offset in offsets:
+                bitfield.get("u1", offset)
+            return await bitfield.execute()
+        except Exception as e:
+            logger.exception(f"Redis BITFIELD error: {e}")
+            return None
+
+    async def hget(self, key: str, field: str) -> Optional[str]:
+        try:
+            return await self.redis.hget(key, field)
+        except Exception as e:
+            logger.exception(f"Redis HGET error: {e}")
+            return None
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        try:
+            return await self.redis.hgetall(key)
+        except Exception as e:
+            logger.exception(f"Redis HGETALL error: {e}")
+            return {}
+
+    async def hset(self, key: str, mapping: Mapping[str, Any]) -> bool:
+        try:
+            await self.redis.hset(key, mapping=mapping)
+            return True
+        except Exception as e:
+            logger.exception(f"Redis HSET error: {e}")
+            return False
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> Optional[int]:
+        try:
+            return await self.redis.hincrby(key, field, amount)
+        except Exception as e:
+            logger.exception(f"Redis HINCRBY error: {e}")
+            return None
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        try:
+            return await self.redis.hdel(key, *fields)
+        except Exception as e:
+            logger.exception(f"Redis HDEL error: {e}")
+            return 0
+
+    async def sadd(self, key: str, *members: Any) -> int:
+        try:
+            return await self.redis.sadd(key, *members)
+        except Exception as e:
+            logger.exception(f"Redis SADD error: {e}")
+            return 0
+
+    async def srem(self, key: str, *members: Any) -> int:
+        try:
+            return await self.redis.srem(key, *members)
+        except Exception as e:
+            logger.exception(f"Redis SREM error: {e}")
+            return 0
+
+    async def smembers(self, key: str) -> set:
+        try:
+            return await self.redis.smembers(key)
+        except Exception as e:
+            logger.exception(f"Redis SMEMBERS error: {e}")
+            return set()
+
+    async def sismember(self, key: str, member: Any) -> bool:
+        try:
+            return bool(await self.redis.sismember(key, member))
+        except Exception as e:
+            logger.exception(f"Redis SISMEMBER error: {e}")
+            return False
+
+    async def scard(self, key: str) -> int:
+        try:
+            return await self.redis.scard(key)
+        except Exception as e:
+            logger.exception(f"Redis SCARD error: {e}")
+            return 0
+
+    async def srandmember(self, key: str, count: int) -> Optional[List[str]]:
+        try:
+            return await self.redis.srandmember(key, count)
+        except Exception as e:
+            logger.exception(f"Redis SRANDMEMBER error: {e}")
+            return None
+
+    async def zadd(self, key: str, mapping: Mapping[Any, float]) -> int:
+        try:
+            return await self.redis.zadd(key, mapping)
+        except Exception as e:
+            logger.exception(f"Redis ZADD error: {e}")
+            return 0
+
+    async def zrem(self, key: str, *members: Any) -> int:
+        try:
+            return await self.redis.zrem(key, *members)
+        except Exception as e:
+            logger.exception(f"Redis ZREM error: {e}")
+            return 0
+
+    async def zincrby(self, key: str, amount: float, member: Any) -> Optional[float]:
+        try:
+            return await self.redis.zincrby(key, amount, member)
+        except Exception as e:
+            logger.exception(f"Redis ZINCRBY error: {e}")
+            return None
+
+    async def zscore(self, key: str, member: Any) -> Optional[float]:
+        try:
+            return await self.redis.zscore(key, member)
+        except Exception as e:
+            logger.exception(f"Redis ZSCORE error: {e}")
+            return None
+
+    async def zcard(self, key: str) -> int:
+        try:
+            return await self.redis.zcard(key)
+        except Exception as e:
+            logger.exception(f"Redis ZCARD error: {e}")
+            return 0
+
+    async def zrevrangebyscore(
+        self,
+        key: str,
+        max_score: Any = "+inf",
+        min_score: Any = "-inf",
+        offset: int = 0,
+        count: Optional[int] = None,
+        withscores: bool = False,
+    ) -> Optional[List[Any]]:
+        try:
+            return await self.redis.zrevrangebyscore(
+                key,
+                max_score,
+                min_score,
+                start=offset if count is not None else None,
+                num=count,
+                withscores=withscores,
+            )
+        except Exception as e:
+            logger.exception(f"Redis ZREVRANGEBYSCORE error: {e}")
+            return None
+
+    async def publish(self, channel: str, message: str) -> int:
+        try:
+            return await self.redis.publish(channel, message)
+        except Exception as e:
+            logger.exception(f"Redis PUBLISH error: {e}")
+            return 0
+
+    def pubsub(self) -> Any:
+        return self.redis.pubsub()
+
+    def register_script(self, name: str, source: str) -> None:
+        self.scripts[name] = self.redis.register_script(source)
+
+    async def eval_script(
+        self, name: str, keys: List[str] = None, args: List[Any] = None
+    ) -> Optional[Any]:
+        try:
+            return await self.scripts[name](keys=keys or [], args=args or [])
+        except Exception as e:
+            logger.exception(f"Redis EVALSHA {name} error: {e}")
+            return None
+
     async def close(self):
         await self.redis.close()
+        await self.binary.close()
 
 
 redis_adapter = AsyncRedisAdapter()
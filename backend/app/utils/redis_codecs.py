@@ -0,0 +1,116 @@
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MAGIC = b"\x01"
+COMPRESSED = b"z"
+STR_TAG = b"s"
+BYTES_TAG = b"b"
+
+
+class Codec:
+    tag: bytes
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    tag = b"j"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    tag = b"o"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=str)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    tag = b"m"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True, default=str)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS: Dict[str, Codec] = {"json": JsonCodec()}
+if orjson is not None:
+    CODECS["orjson"] = OrjsonCodec()
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec()
+
+CODECS_BY_TAG: Dict[bytes, Codec] = {codec.tag: codec for codec in CODECS.values()}
+
+
+def get_codec(name: str) -> Codec:
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise RuntimeError(f"Redis codec '{name}' is not available") from None
+
+
+# Values are stored as MAGIC + [COMPRESSED] + tag + payload. Values without the header
+# (plain SET/INCR) are returned as strings, so "123" is never turned into an int.
+class ValueSerializer:
+    def __init__(self, codec: Codec, compress_threshold: int = 0, compress_level: int = 1):
+        self.codec = codec
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    def dumps(self, value: Any, codec: Optional[Codec] = None) -> bytes:
+        if isinstance(value, str):
+            body = STR_TAG + value.encode()
+        elif isinstance(value, bytes):
+            body = BYTES_TAG + value
+        else:
+            codec = codec or self.codec
+            body = codec.tag + codec.dumps(value)
+
+        if self.compress_threshold and len(body) > self.compress_threshold:
+            return MAGIC + COMPRESSED + zlib.compress(body, self.compress_level)
+        return MAGIC + body
+
+    def loads(self, data: Optional[bytes]) -> Any:
+        if data is None:
+            return None
+        if data[:1] != MAGIC:
+            return data.decode()
+
+        body = data[1:]
+        if body[:1] == COMPRESSED:
+            body = zlib.decompress(body[1:])
+
+        tag, payload = body[:1], body[1:]
+        if tag == STR_TAG:
+            return payload.decode()
+        if tag == BYTES_TAG:
+            return payload
+        codec = CODECS_BY_TAG.get(tag)
+        if codec is None:
+            raise ValueError(f"Unknown Redis value tag: {tag!r}")
+        return codec.loads(payload)
@@ -0,0 +1,141 @@
+import asyncio
+import math
+import random
+from functools import wraps
+from time import monotonic, time
+from typing import Any, Awaitable, Callable, Dict
+from uuid import uuid4
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.utils.near_cache import NearCache, near_cache
+from app.utils.redis_adapter import AsyncRedisAdapter, redis_adapter
+
+logger = get_logger()
+
+UNLOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class ResponseCache:
+    def __init__(self, redis: AsyncRedisAdapter = redis_adapter, local: NearCache = near_cache):
+        self.redis = redis
+        self.local = local
+        self.enabled = settings.cache_settings.cache_enabled
+        self.beta = settings.cache_settings.cache_early_refresh_beta
+        self.lock_ttl = settings.cache_settings.cache_lock_ttl
+        self.lock_wait = settings.cache_settings.cache_lock_wait
+        self.inflight: Dict[str, asyncio.Task] = {}
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.early_refreshes = 0
+        self.redis.register_script("cache_unlock", UNLOCK_SCRIPT)
+
+    @staticmethod
+    def key(namespace: str, *parts: Any) -> str:
+        return ":".join(["cache", namespace, *(str(part) for part in parts)])
+
+    def _is_fresh(self, entry: Any) -> bool:
+        # XFetch: recompute early with a probability that grows as expiry approaches,
+        # scaled by how long the last recomputation took
+        if not isinstance(entry, dict) or "value" not in entry:
+            return False
+        jitter = entry["delta"] * self.beta * math.log(1.0 - random.random())
+        return time() - jitter < entry["expiry"]
+
+    async def _store(self, key: str, value: Any, ttl: int, delta: float) -> None:
+        entry = {"value": value, "delta": delta, "expiry": time() + ttl}
+        await self.redis.set(key, entry, expire=ttl)
+        self.local.set(key, entry, ttl=ttl)
+
+    async def _recompute(
+        self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int, stale: Any
+    ) -> Any:
+        lock_key = f"{key}:lock"
+        token = uuid4().hex
+        locked = await self.redis.set_nx(lock_key, token, expire=self.lock_ttl)
+        if locked is False:
+            if isinstance(stale, dict) and "value" in stale:
+                return stale["value"]
+            deadline = monotonic() + self.lock_wait
+            while monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                entry = await self.redis.get(key)
+                if isinstance(entry, dict) and "value" in entry:
+                    return entry["value"]
+            logger.warning(f"Cache lock wait timed out for {key}")
+
+        try:
+            started = monotonic()
+            value = await loader()
+            if value is not None:
+                await self._store(key, value, ttl, monotonic() - started)
+            return value
+        finally:
+            if locked:
+                await self.redis.eval_script("cache_unlock", keys=[lock_key], args=[token])
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        if not self.enabled:
+            return await loader()
+
+        entry = self.local.get(key)
+        if self._is_fresh(entry):
+            self.local_hits += 1
+            return entry["value"]
+
+        entry = await self.redis.get(key)
+        if self._is_fresh(entry):
+            self.redis_hits += 1
+            self.local.set(key, entry, ttl=entry["expiry"] - time())
+            return entry["value"]
+
+        if isinstance(entry, dict):
+            self.early_refreshes += 1
+        else:
+            self.misses += 1
+
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._recompute(key, loader, ttl, entry))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def invalidate(self, namespace: str, *parts: Any) -> None:
+        if not self.enabled:
+            return
+        key = self.key(namespace, *parts)
+        await self.redis.delete(key)
+        await self.local.invalidate(key)
+
+    def cached(self, namespace: str, ttl: int) -> Callable:
+        def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            @wraps(func)
+            async def wrapper(*args: Any) -> Any:
+                return await self.get_or_load(self.key(namespace, *args), lambda: func(*args), ttl)
+
+            wrapper.invalidate = lambda *args: self.invalidate(namespace, *args)
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.local_hits + self.redis_hits + self.misses + self.early_refreshes
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "early_refreshes": self.early_refreshes,
+            "local_hit_ratio": self.local_hits / total if total else 0.0,
+            "redis_hit_ratio": self.redis_hits / total if total else 0.0,
+            "inflight": len(self.inflight),
+        }
+
+
+response_cache = ResponseCache()
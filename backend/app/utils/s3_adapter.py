@@ -5,6 +5,7 @@ from urllib.parse import quote
 import aiofiles
 import httpx
 from app.core.logging import get_logger
+from app.core.metrics import s3_request_hook, s3_response_hook
 from app.core.settings import settings
 from httpx_aws_auth import AwsCredentials, AwsSigV4Auth
 
@@ -23,7 +24,9 @@ class S3HttpxSigV4Adapter:
         )
         self.auth = AwsSigV4Auth(credentials=creds, region=region, service="s3")
         self.client = httpx.AsyncClient(
-            auth=self.auth, timeout=httpx.Timeout(600.0, connect=10.0, read=600.0)
+            auth=self.auth,
+            timeout=httpx.Timeout(600.0, connect=10.0, read=600.0),
+            event_hooks={"request": [s3_request_hook], "response": [s3_response_hook]},
         )
 
     async def _stream_file_parts(self, path: str) -> AsyncIterator[bytes]:
@@ -0,0 +1,70 @@
+from hashlib import blake2b
+from time import time
+from typing import Any, List
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.utils.redis_adapter import AsyncRedisAdapter, redis_adapter
+
+logger = get_logger()
+
+
+class SeenFilter:
+    def __init__(
+        self,
+        redis: AsyncRedisAdapter = redis_adapter,
+        size_bits: int = settings.feed_settings.seen_filter_bits,
+        hashes: int = settings.feed_settings.seen_filter_hashes,
+        ttl_days: int = settings.feed_settings.seen_filter_ttl_days,
+    ):
+        self.redis = redis
+        self.size_bits = size_bits
+        self.hashes = hashes
+        # Views land in a filter per half-TTL period that expires at a fixed time, so an active
+        # user's filter is replaced before it saturates; checks also look at the previous period
+        self.period = max(ttl_days * 24 * 60 * 60 // 2, 1)
+
+    def _bucket(self) -> int:
+        return int(time() // self.period)
+
+    @staticmethod
+    def _key(user_id: Any, bucket: int) -> str:
+        return f"seen:{user_id}:{bucket}"
+
+    def _offsets(self, video_id: Any) -> List[int]:
+        digest = blake2b(str(video_id).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.hashes)]
+
+    async def add(self, user_id: Any, video_id: Any) -> None:
+        bucket = self._bucket()
+        key = self._key(user_id, bucket)
+        try:
+            async with self.redis.pipeline() as pipe:
+                bitfield = pipe.bitfield(key)
+                for offset in self._offsets(video_id):
+                    bitfield.set("u1", offset, 1)
+                bitfield.execute()
+                pipe.expireat(key, (bucket + 2) * self.period)
+        except Exception as e:
+            logger.exception(f"Seen filter ADD error: {e}")
+
+    async def filter_unseen(self, user_id: Any, video_ids: List[Any]) -> List[Any]:
+        if not video_ids:
+            return []
+        offsets = [offset for video_id in video_ids for offset in self._offsets(video_id)]
+        bucket = self._bucket()
+        seen = [False] * len(video_ids)
+        for key in (self._key(user_id, bucket), self._key(user_id, bucket - 1)):
+            bits = await self.redis.bitfield_get(key, offsets)
+            if bits is None:
+                # Showing a seen video again beats an empty feed
+                return list(video_ids)
+            for i in range(len(video_ids)):
+                seen[i] = seen[i] or all(bits[i * self.hashes : (i + 1) * self.hashes])
+
+        return [video_id for video_id, was_seen in zip(video_ids, seen) if not was_seen]
+
+
+seen_filter = SeenFilter()
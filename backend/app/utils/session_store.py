@@ -0,0 +1,73 @@
+from typing import Any, Dict, Tuple
+from uuid import uuid4
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.utils.redis_adapter import AsyncRedisAdapter, redis_adapter
+from app.utils.token_manager import TokenManager
+from fastapi.exceptions import HTTPException
+
+logger = get_logger()
+
+
+def _unavailable() -> HTTPException:
+    # Sessions fail closed: without Redis a revoked or reused token can't be told apart
+    return HTTPException(503, "Session store unavailable")
+
+
+class SessionStore:
+    def __init__(self, redis: AsyncRedisAdapter = redis_adapter):
+        self.redis = redis
+        self.ttl = settings.jwt_settings.refresh_token_expire_days * 24 * 60 * 60
+
+    @staticmethod
+    def _session_key(user_id: Any, jti: str) -> str:
+        return f"session:{user_id}:{jti}"
+
+    @staticmethod
+    def _generation_key(user_id: Any) -> str:
+        return f"session_gen:{user_id}"
+
+    async def generation(self, user_id: Any) -> int:
+        generation = await self.redis.get_counter(self._generation_key(user_id))
+        if generation is None:
+            raise _unavailable()
+        return generation
+
+    async def issue(self, user_id: Any) -> Tuple[str, str]:
+        generation = await self.generation(user_id)
+        jti = uuid4().hex
+        if not await self.redis.set(self._session_key(user_id, jti), generation, expire=self.ttl):
+            raise _unavailable()
+        access = TokenManager.create_token({"sub": str(user_id), "gen": generation})
+        refresh = TokenManager.create_token(
+            {"sub": str(user_id), "gen": generation, "jti": jti}, access=False
+        )
+        return access, refresh
+
+    async def rotate(self, user_id: Any, payload: Dict[str, Any]) -> Tuple[str, str]:
+        jti = payload.get("jti")
+        deleted = await self.redis.delete(self._session_key(user_id, jti)) if jti else False
+        if deleted is None:
+            raise _unavailable()
+        if not deleted:
+            logger.warning(f"Refresh token reuse or unknown session for user {user_id}")
+            await self.revoke_all(user_id)
+            raise HTTPException(401, "Session expired")
+        return await self.issue(user_id)
+
+    async def revoke(self, user_id: Any, payload: Dict[str, Any]) -> None:
+        jti = payload.get("jti")
+        if jti:
+            await self.redis.delete(self._session_key(user_id, jti))
+
+    async def revoke_all(self, user_id: Any) -> None:
+        if await self.redis.incr(self._generation_key(user_id)) is None:
+            raise _unavailable()
+
+    async def check(self, user_id: Any, payload: Dict[str, Any]) -> None:
+        if payload.get("gen", 0) != await self.generation(user_id):
+            raise HTTPException(401, "Session revoked")
+
+
+session_store = SessionStore()
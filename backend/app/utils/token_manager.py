@@ -1,10 +1,17 @@
 from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from time import time
 from typing import Any, Dict
 
 from app.core.logging import get_logger
 from app.core.settings import settings
+from app.utils.ttl_cache import TTLCache
 from fastapi.exceptions import HTTPException
-from jose import JWTError, jwt
+from jose import ExpiredSignatureError, JWTError, jwt
+
+if settings.jwt_settings.jwt_backend == "pyjwt":
+    # Imported here so a missing PyJWT fails at startup, not on every request
+    import jwt as pyjwt
 
 logger = get_logger()
 
@@ -13,6 +20,15 @@ class TokenManager:
     SECRET_KEY = settings.jwt_settings.jwt_secret_key.get_secret_value()
     ALGORITHM = settings.jwt_settings.jwt_algorithm
     ACCESS_TOKEN_EXPIRE_MINUTES = settings.jwt_settings.access_token_expire_min
+    REFRESH_TOKEN_EXPIRE_DAYS = settings.jwt_settings.refresh_token_expire_days
+    BACKEND = settings.jwt_settings.jwt_backend
+
+    verified_cache = TTLCache(
+        settings.jwt_settings.jwt_cache_size, settings.jwt_settings.jwt_cache_max_ttl
+    )
+    rejected_cache = TTLCache(
+        settings.jwt_settings.jwt_cache_size, settings.jwt_settings.jwt_negative_cache_ttl
+    )
 
     @staticmethod
     def create_token(data: Dict[str, Any], access: bool = True) -> str:
@@ -24,6 +40,10 @@ class TokenManager:
             to_encode.update({"exp": expire})
             to_encode.update({"type": "access"})
         else:
+            expire = datetime.now(timezone.utc) + timedelta(
+                days=TokenManager.REFRESH_TOKEN_EXPIRE_DAYS
+            )
+            to_encode.update({"exp": expire})
             to_encode.update({"type": "refresh"})
         encoded_jwt = jwt.encode(
             to_encode,
@@ -33,29 +53,50 @@ class TokenManager:
         return encoded_jwt
 
     @staticmethod
-    def decode_token(token: str, access: bool = True) -> Dict[str, Any]:
+    def _verify(token: str) -> Dict[str, Any]:
+        if TokenManager.BACKEND == "pyjwt":
+            try:
+                return pyjwt.decode(
+                    token, TokenManager.SECRET_KEY, algorithms=[TokenManager.ALGORITHM]
+                )
+            except pyjwt.ExpiredSignatureError:
+                raise HTTPException(401, "Token has expired")
+            except pyjwt.InvalidTokenError:
+                raise HTTPException(401, "Invalid token")
+
         try:
-            payload = jwt.decode(
-                token,
-                TokenManager.SECRET_KEY,
-                algorithms=[TokenManager.ALGORITHM],
-            )
-            if not payload:
-                logger.info("No token data")
-                raise HTTPException(401, "No token data")
-            type = "access" if access else "refresh"
-            if payload.get("type") != type:
-                logger.info("Invalid token type")
-                raise HTTPException(401, "Invalid token type")
-            if access:
-                if payload.get("exp"):
-                    if datetime.fromtimestamp(payload.get("exp"), timezone.utc) < datetime.now(
-                        timezone.utc
-                    ):
-                        logger.info("Token has expired")
-                        raise HTTPException(401, "Token has expired")
-                else:
-                    raise HTTPException(401, "Invalid token")
-            return payload
+            return jwt.decode(token, TokenManager.SECRET_KEY, algorithms=[TokenManager.ALGORITHM])
+        except ExpiredSignatureError:
+            raise HTTPException(401, "Token has expired")
         except JWTError:
             raise HTTPException(401, "Invalid token")
+
+    @staticmethod
+    def decode_token(token: str, access: bool = True) -> Dict[str, Any]:
+        digest = sha256(token.encode()).digest()
+        payload = TokenManager.verified_cache.get(digest)
+        if payload is None:
+            detail = TokenManager.rejected_cache.get(digest)
+            if detail:
+                raise HTTPException(401, detail)
+            try:
+                payload = TokenManager._verify(token)
+            except HTTPException as e:
+                logger.info(e.detail)
+                TokenManager.rejected_cache.set(digest, e.detail)
+                raise
+            ttl = settings.jwt_settings.jwt_cache_max_ttl
+            if payload.get("exp"):
+                ttl = min(ttl, payload["exp"] - time())
+            TokenManager.verified_cache.set(digest, payload, ttl=ttl)
+
+        if not payload:
+            logger.info("No token data")
+            raise HTTPException(401, "No token data")
+        type = "access" if access else "refresh"
+        if payload.get("type") != type:
+            logger.info("Invalid token type")
+            raise HTTPException(401, "Invalid token type")
+        if not payload.get("exp"):
+            raise HTTPException(401, "Invalid token")
+        return payload
@@ -0,0 +1,43 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(value: str) -> Set[str]:
+    # Same extraction as pg_trgm: lowercase words padded with two spaces in front and one behind
+    result = set()
+    for word in WORD_RE.findall(value.lower()):
+        padded = f"  {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class TrigramIndex:
+    def __init__(self, values: Iterable[str]):
+        self.grams: Dict[str, Set[str]] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        for value in values:
+            if value is None or value in self.grams:
+                continue
+            grams = trigrams(value)
+            self.grams[value] = grams
+            for gram in grams:
+                self.postings[gram].add(value)
+
+    def search(self, query: str, threshold: float, limit: int) -> List[Tuple[str, float]]:
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for value in self.postings.get(gram, ()):
+                shared[value] += 1
+        scored = []
+        for value, common in shared.items():
+            score = common / (len(query_grams) + len(self.grams[value]) - common)
+            if score >= threshold:
+                scored.append((value, score))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.database.adapter import adapter
+from app.database.models import User
+from app.utils.near_cache import NearCache, near_cache
+from app.utils.redis_adapter import AsyncRedisAdapter, redis_adapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = get_logger()
+
+USER_FIELDS = (
+    "id",
+    "email",
+    "name",
+    "username",
+    "avatar_url",
+    "description",
+    "followers_count",
+    "subscriptions_count",
+    "created_at",
+    "updated_at",
+)
+
+
+class UserCache:
+    def __init__(self, redis: AsyncRedisAdapter = redis_adapter, local: NearCache = near_cache):
+        self.redis = redis
+        self.local = local
+        self.enabled = settings.user_cache_settings.user_cache_enabled
+        self.ttl = settings.user_cache_settings.user_cache_ttl
+        self.local_hits = 0
+        self.local_misses = 0
+        self.redis_hits = 0
+        self.redis_misses = 0
+
+    @staticmethod
+    def _key(user_id: Any) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def _dump(user: User) -> Dict[str, Any]:
+        data = {field: getattr(user, field) for field in USER_FIELDS}
+        data["id"] = str(data["id"])
+        for field in ("created_at", "updated_at"):
+            if data[field] is not None:
+                data[field] = data[field].isoformat()
+        return data
+
+    @staticmethod
+    def _load(data: Dict[str, Any]) -> User:
+        data = dict(data)
+        data["id"] = UUID(data["id"])
+        for field in ("created_at", "updated_at"):
+            if data.get(field) is not None:
+                data[field] = datetime.fromisoformat(data[field])
+        return User(**data)
+
+    async def get(self, user_id: Any, session: AsyncSession | None = None) -> Optional[User]:
+        if not self.enabled:
+            return await adapter.get_by_id(User, user_id, session=session)
+
+        key = self._key(user_id)
+        data = self.local.get(key)
+        if data is not None:
+            self.local_hits += 1
+        else:
+            self.local_misses += 1
+            data = await self.redis.get(key)
+            if isinstance(data, dict):
+                self.redis_hits += 1
+            else:
+                self.redis_misses += 1
+                async with adapter.primary_session() as primary:
+                    user = await adapter.get_by_id(User, user_id, session=primary)
+                if not user:
+                    return None
+                data = self._dump(user)
+                await self.redis.set(key, data, expire=self.ttl)
+            self.local.set(key, data)
+        return self._load(data)
+
+    async def invalidate(self, *user_ids: Any) -> None:
+        if not self.enabled:
+            return
+        keys = [self._key(user_id) for user_id in user_ids]
+        for key in keys:
+            await self.redis.delete(key)
+        await self.local.invalidate(*keys)
+
+    async def on_change(self, user_ids: List[Any], fields: Optional[Set[str]]) -> None:
+        await self.invalidate(*user_ids)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.local_hits + self.local_misses
+        return {
+            "local_hits": self.local_hits,
+            "local_misses": self.local_misses,
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+            "local_hit_ratio": self.local_hits / total if total else 0.0,
+            "redis_hit_ratio": self.redis_hits / self.local_misses if self.local_misses else 0.0,
+        }
+
+
+user_cache = UserCache()
+adapter.add_listener(User, user_cache.on_change)
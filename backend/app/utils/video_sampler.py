@@ -0,0 +1,87 @@
+from typing import Any, List
+from uuid import UUID
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.database.adapter import adapter
+from app.database.models import Video
+from app.utils.redis_adapter import AsyncRedisAdapter, redis_adapter
+from app.utils.seen_filter import seen_filter
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = get_logger()
+
+
+class VideoSampler:
+    KEY = "videos:ids"
+    WARM_UP_BATCH = 5000
+
+    def __init__(self, redis: AsyncRedisAdapter = redis_adapter):
+        self.redis = redis
+
+    async def warm_up(self, force: bool = False) -> None:
+        try:
+            if not force and await self.redis.scard(self.KEY):
+                return
+            async with adapter.SessionLocal() as session:
+                result = await session.stream_scalars(
+                    select(Video.id).execution_options(yield_per=self.WARM_UP_BATCH)
+                )
+                async for batch in result.partitions():
+                    await self.redis.sadd(self.KEY, *[str(video_id) for video_id in batch])
+            logger.info("Video sampler warmed up")
+        except Exception as e:
+            logger.exception(f"Video sampler warm up error: {e}")
+
+    async def add(self, video_id: Any) -> None:
+        await self.redis.sadd(self.KEY, str(video_id))
+
+    async def remove(self, *video_ids: Any) -> None:
+        await self.redis.srem(self.KEY, *[str(video_id) for video_id in video_ids])
+
+    async def sample(self, count: int = 1) -> List[UUID]:
+        video_ids = await self.redis.srandmember(self.KEY, count)
+        if video_ids is not None:
+            return [UUID(video_id) for video_id in video_ids]
+        async with adapter.SessionLocal() as session:
+            result = await session.execute(select(Video.id).order_by(func.random()).limit(count))
+            return result.scalars().all()
+
+    async def pick_videos(
+        self, user_id: Any, count: int, session: AsyncSession | None = None
+    ) -> List[Any]:
+        rows = []
+        picked = set()
+        seen_ids = []
+        for _ in range(settings.feed_settings.feed_max_attempts):
+            candidates = await self.sample(max(count, settings.feed_settings.feed_sample_size))
+            candidates = [video_id for video_id in candidates if video_id not in picked]
+            if not candidates:
+                break
+
+            unseen_ids = await seen_filter.filter_unseen(user_id, candidates)
+            seen_ids.extend(video_id for video_id in candidates if video_id not in unseen_ids)
+            unseen_ids = unseen_ids[: count - len(rows)]
+            if not unseen_ids:
+                continue
+
+            found = await adapter.get_videos_with_author(unseen_ids, user_id, session=session)
+            stale_ids = set(unseen_ids) - {row[0].id for row in found}
+            if stale_ids:
+                logger.warning(f"Stale video ids in sampler: {stale_ids}")
+                await self.remove(*stale_ids)
+
+            rows.extend(found)
+            picked.update(row[0].id for row in found)
+            if len(rows) >= count:
+                return rows
+
+        fill_ids = [video_id for video_id in dict.fromkeys(seen_ids) if video_id not in picked]
+        fill_ids = fill_ids[: count - len(rows)]
+        if fill_ids:
+            rows.extend(await adapter.get_videos_with_author(fill_ids, user_id, session=session))
+        return rows
+
+
+video_sampler = VideoSampler()
@@ -0,0 +1,96 @@
+import os
+
+# Settings are read on import; the suite runs on SQLite and fakeredis without a .env
+for name, value in {
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "JWT_SECRET_KEY": "test",
+    "JWT_ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MIN": "30",
+    "REDIS_PASS": "test",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_DB": "0",
+    "CELERY_DB": "1",
+    "CELERY_BACK_DB": "2",
+    "ACCESS_KEY": "test",
+    "SECRET_KEY": "test",
+    "ENDPOINT_URL": "http://s3.test",
+    "BUCKET1": "videos",
+    "BUCKET2": "avatars",
+    "EMAIL_HOST": "localhost",
+    "EMAIL_PORT": "465",
+    "EMAIL_USERNAME": "test",
+    "EMAIL_PASSWORD": "test",
+    "DEFAULT_AVATAR_URL": "http://avatar.test",
+    "FRONTEND_URL": "http://frontend.test",
+    "BACKEND_URL": "http://backend.test",
+}.items():
+    os.environ.setdefault(name, value)
+
+import fakeredis
+import pytest
+from app.core import query_tracker
+from app.database.adapter import AsyncDatabaseAdapter, adapter
+from app.database.models import User
+from app.utils.redis_adapter import redis_adapter
+from app.utils.token_manager import TokenManager
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch) -> AsyncDatabaseAdapter:
+    test_db = AsyncDatabaseAdapter(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", [])
+    monkeypatch.setattr(adapter, "engine", test_db.engine)
+    monkeypatch.setattr(adapter, "SessionLocal", test_db.SessionLocal)
+    monkeypatch.setattr(adapter, "router", None)
+    return test_db
+
+
+@pytest.fixture
+def redis(monkeypatch) -> fakeredis.FakeServer:
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis_adapter, "redis", fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    )
+    monkeypatch.setattr(redis_adapter, "binary", fakeredis.aioredis.FakeRedis(server=server))
+    for name, script in list(redis_adapter.scripts.items()):
+        monkeypatch.setitem(
+            redis_adapter.scripts, name, redis_adapter.redis.register_script(script.script)
+        )
+    return server
+
+
+@pytest.fixture
+def client(db, redis):
+    from app.main import app
+
+    # Async helpers go through client.portal so they share the app's event loop
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def user(client) -> User:
+    user = client.portal.call(
+        adapter.insert,
+        User,
+        {"email": "user@example.com", "name": "User", "username": "@user", "hashed_password": "x"},
+    )
+    client.cookies.update(
+        {
+            "access_token": TokenManager.create_token({"sub": str(user.id)}),
+            "refresh_token": TokenManager.create_token({"sub": str(user.id)}, access=False),
+        }
+    )
+    return user
+
+
+@pytest.fixture
+def query_budget():
+    # Requests made through the TestClient run under the caller's tracker, so a block like
+    # `with query_budget(3): client.get(...)` fails when an endpoint starts issuing N+1 queries
+    return query_tracker.query_budget
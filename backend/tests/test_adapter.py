@@ -0,0 +1,28 @@
+import asyncio
+
+from app.database.adapter import AsyncDatabaseAdapter
+from app.database.models import User
+
+
+def test_adapter_runs_on_aiosqlite(tmp_path):
+    async def scenario():
+        db = AsyncDatabaseAdapter(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", [])
+        try:
+            await db.initialize_tables()
+            await db.insert(
+                User,
+                {
+                    "email": "john@example.com",
+                    "name": "John Smith",
+                    "username": "@john",
+                    "hashed_password": "x",
+                },
+            )
+            return await db.find_similar_value(User, "name", "jon smith")
+        finally:
+            await db.engine.dispose()
+
+    matches = asyncio.run(scenario())
+
+    # No pg_trgm here, so this goes through the in-memory trigram index
+    assert [match["name"] for match in matches] == ["John Smith"]
@@ -0,0 +1,24 @@
+import asyncio
+
+from app.core.metrics import DB_POOL_OVERFLOW, TimedQueuePool, instrument_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+def test_pool_overflow_gauge_drops_after_checkin(tmp_path):
+    async def scenario():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=TimedQueuePool,
+            pool_size=1,
+            max_overflow=2,
+        )
+        instrument_engine(engine)
+        connections = [await engine.connect() for _ in range(3)]
+        peak = DB_POOL_OVERFLOW._value.get()
+        for connection in connections:
+            await connection.close()
+        settled = DB_POOL_OVERFLOW._value.get()
+        await engine.dispose()
+        return peak, settled
+
+    assert asyncio.run(scenario()) == (2, 0)
@@ -0,0 +1,49 @@
+from uuid import uuid4
+
+import pytest
+from app.database.adapter import adapter
+from app.database.models import Comment, Video
+from app.utils.video_sampler import video_sampler
+
+
+@pytest.fixture(params=[2, 10])
+def videos(request, client, user):
+    videos = []
+    for _ in range(request.param):
+        video = client.portal.call(
+            adapter.insert,
+            Video,
+            {"id": uuid4(), "url": f"http://s3.test/videos/{uuid4()}.mp4", "author_id": user.id},
+        )
+        client.portal.call(video_sampler.add, video.id)
+        for _ in range(request.param):
+            client.portal.call(
+                adapter.insert,
+                Comment,
+                {
+                    "video_id": video.id,
+                    "user_id": user.id,
+                    "user_name": user.name,
+                    "user_username": user.username,
+                    "content": "comment",
+                },
+            )
+        videos.append(video)
+    return videos
+
+
+def test_video_batch_query_count_is_flat(client, videos, query_budget):
+    with query_budget(3):
+        response = client.get("/api/get-video-batch", params={"count": len(videos)})
+
+    assert response.status_code == 200
+    assert len(response.json()["videos"]) == len(videos)
+
+
+@pytest.mark.parametrize("params", [{}, {"sort": "top", "limit": 50}])
+def test_comments_query_count_is_flat(client, videos, query_budget, params):
+    with query_budget(4):
+        response = client.get(f"/api/get-comments/{videos[0].id}", params=params)
+
+    assert response.status_code == 200
+    assert len(response.json()) == len(videos)
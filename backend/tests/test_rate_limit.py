@@ -0,0 +1,37 @@
+import pytest
+from app.dependencies.rate_limit import RateLimiter
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+app = FastAPI()
+
+
+@app.get("/limited", dependencies=[Depends(RateLimiter("test", "1/60"))])
+async def limited():
+    return {}
+
+
+@pytest.fixture
+def proxied(redis):
+    # nginx on the docker bridge network
+    return TestClient(app, client=("172.18.0.2", 50000))
+
+
+@pytest.fixture
+def direct(redis):
+    return TestClient(app, client=("203.0.113.7", 50000))
+
+
+def get(client, real_ip):
+    return client.get("/limited", headers={"X-Real-IP": real_ip}).status_code
+
+
+def test_proxied_clients_get_separate_buckets(proxied):
+    assert get(proxied, "198.51.100.1") == 200
+    assert get(proxied, "198.51.100.2") == 200
+    assert get(proxied, "198.51.100.1") == 429
+
+
+def test_x_real_ip_from_untrusted_peer_is_ignored(direct):
+    assert get(direct, "198.51.100.1") == 200
+    assert get(direct, "198.51.100.2") == 429
@@ -0,0 +1,53 @@
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+from app.utils import seen_filter as seen_filter_module
+from app.utils.redis_adapter import redis_adapter
+from app.utils.seen_filter import SeenFilter
+
+
+@pytest.fixture
+def seen(redis) -> SeenFilter:
+    return SeenFilter(redis_adapter)
+
+
+def test_added_videos_are_filtered(seen):
+    user_id, watched, fresh = uuid4(), uuid4(), uuid4()
+
+    async def scenario():
+        await seen.add(user_id, watched)
+        return await seen.filter_unseen(user_id, [watched, fresh])
+
+    assert asyncio.run(scenario()) == [fresh]
+
+
+def test_redis_outage_treats_everything_as_unseen(seen, redis):
+    user_id, watched = uuid4(), uuid4()
+
+    async def scenario():
+        await seen.add(user_id, watched)
+        redis.connected = False
+        return await seen.filter_unseen(user_id, [watched])
+
+    assert asyncio.run(scenario()) == [watched]
+
+
+def test_views_expire_with_their_period_instead_of_sliding(seen, monkeypatch):
+    user_id, old, recent = uuid4(), uuid4(), uuid4()
+    start = time.time()
+
+    def at(offset):
+        monkeypatch.setattr(seen_filter_module, "time", lambda: start + offset)
+
+    async def scenario():
+        at(0)
+        await seen.add(user_id, old)
+        at(seen.period)
+        await seen.add(user_id, recent)
+        next_period = await seen.filter_unseen(user_id, [old, recent])
+        at(2 * seen.period)
+        return next_period, await seen.filter_unseen(user_id, [old, recent])
+
+    assert asyncio.run(scenario()) == ([], [old])
@@ -0,0 +1,68 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from app.utils.redis_adapter import redis_adapter
+from app.utils.session_store import SessionStore
+from app.utils.token_manager import TokenManager
+from fastapi.exceptions import HTTPException
+
+
+@pytest.fixture
+def store(redis) -> SessionStore:
+    return SessionStore(redis_adapter)
+
+
+def refresh_payload(refresh: str):
+    return TokenManager.decode_token(refresh, access=False)
+
+
+def test_reused_refresh_token_revokes_all_sessions(store):
+    async def scenario():
+        user_id = uuid4()
+        _, refresh = await store.issue(user_id)
+        payload = refresh_payload(refresh)
+        await store.rotate(user_id, payload)
+        with pytest.raises(HTTPException) as error:
+            await store.rotate(user_id, payload)
+        return error.value.status_code, await store.generation(user_id)
+
+    assert asyncio.run(scenario()) == (401, 1)
+
+
+def test_redis_error_during_rotate_keeps_sessions(store, redis):
+    async def scenario():
+        user_id = uuid4()
+        _, refresh = await store.issue(user_id)
+        payload = refresh_payload(refresh)
+        redis.connected = False
+        with pytest.raises(HTTPException) as error:
+            await store.rotate(user_id, payload)
+        redis.connected = True
+        await store.rotate(user_id, payload)
+        return error.value.status_code, await store.generation(user_id)
+
+    assert asyncio.run(scenario()) == (503, 0)
+
+
+def test_check_fails_closed_while_redis_is_down(store, redis):
+    async def scenario():
+        user_id = uuid4()
+        await store.revoke_all(user_id)
+        redis.connected = False
+        with pytest.raises(HTTPException) as error:
+            await store.check(user_id, {"sub": str(user_id), "gen": 0})
+        return error.value.status_code
+
+    assert asyncio.run(scenario()) == 503
+
+
+def test_check_rejects_revoked_generation(store):
+    async def scenario():
+        user_id = uuid4()
+        await store.revoke_all(user_id)
+        with pytest.raises(HTTPException) as error:
+            await store.check(user_id, {"sub": str(user_id), "gen": 0})
+        return error.value.status_code
+
+    assert asyncio.run(scenario()) == 401
@@ -0,0 +1,56 @@
+from uuid import uuid4
+
+import pytest
+import requests
+from app.core.settings import settings
+from app.database.adapter import adapter
+from app.database.models import Video, View
+from app.utils.seen_filter import seen_filter
+
+
+class FakeOrigin:
+    status_code = 206
+    headers = {"Content-Length": "4", "Content-Range": "bytes 0-3/100", "Accept-Ranges": "bytes"}
+
+    def iter_content(self, chunk_size):
+        yield b"data"
+
+
+@pytest.fixture(autouse=True)
+def origin(monkeypatch):
+    monkeypatch.setattr(requests, "get", lambda url, **kwargs: FakeOrigin())
+
+
+@pytest.fixture
+def video(client, user) -> Video:
+    return client.portal.call(
+        adapter.insert,
+        Video,
+        {"id": uuid4(), "url": f"http://s3.test/videos/{uuid4()}.mp4", "author_id": user.id},
+    )
+
+
+def watched(client, user, video):
+    views = client.portal.call(adapter.get_by_id, Video, video.id).views
+    recorded = client.portal.call(
+        adapter.get_by_values, View, {"user_id": user.id, "video_id": video.id}
+    )
+    unseen = client.portal.call(seen_filter.filter_unseen, user.id, [video.id])
+    return views, len(recorded), unseen == []
+
+
+def test_prefetch_range_does_not_count_a_view(client, user, video):
+    prefetch = f"bytes=0-{settings.feed_settings.feed_prefetch_bytes - 1}"
+
+    response = client.get(f"/api/stream-video/{video.id}", headers={"Range": prefetch})
+
+    assert response.status_code == 206
+    assert watched(client, user, video) == (0, 0, False)
+
+
+def test_playback_counts_one_view(client, user, video):
+    for _ in range(2):
+        response = client.get(f"/api/stream-video/{video.id}", headers={"Range": "bytes=0-"})
+        assert response.status_code == 206
+
+    assert watched(client, user, video) == (1, 1, True)